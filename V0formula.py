@@ -57,12 +57,70 @@ from tonesequencer import ToneSequencer
 
 
 
+try:
+    import ahocorasick  # optional: pip install pyahocorasick
+except Exception:  # pragma: no cover
+    ahocorasick = None  # type: ignore
+
+
 class V0Formula:
-    def __init__(self, weights): self.weights = weights
+    CATEGORIES = ("time", "meaning", "reflection", "gravity")
+
+    def __init__(self, weights):
+        self.weights = weights
+        # Flattened keyword table (parallel tuples) for the fallback scan, so
+        # calculate() never walks the nested weights dicts per call.
+        flat = [
+            (kw, cat_idx, val)
+            for cat_idx, cat in enumerate(self.CATEGORIES)
+            for kw, val in self.weights.get(cat, {}).items()
+        ]
+        self._kw = tuple(kw for kw, _, _ in flat)
+        self._kw_cat = tuple(cat_idx for _, cat_idx, _ in flat)
+        self._kw_val = tuple(val for _, _, val in flat)
+        # UTF-8 is self-synchronizing, so bytes.count on the encoded text gives
+        # the same non-overlapping counts as str.count, on the faster bytes
+        # search. An empty keyword counts differently in bytes; keep str then.
+        self._kw_bytes = (
+            tuple(kw.encode("utf-8") for kw in self._kw) if all(self._kw) else None
+        )
+        # One automaton over every keyword: a single pass over the text yields
+        # all hits, instead of one text.count() scan per keyword. An empty
+        # keyword can't be matched by it, so the scan handles that table.
+        self._automaton = None
+        if ahocorasick is not None and self._kw_bytes is not None:
+            hits = {}
+            for kw, cat_idx, val in flat:
+                hits.setdefault(kw, []).append((cat_idx, val))
+            if hits:
+                auto = ahocorasick.Automaton()
+                for kw, pairs in hits.items():
+                    auto.add_word(kw, (kw, len(kw), tuple(pairs)))
+                auto.make_automaton()
+                self._automaton = auto
+
     def calculate(self, text: str):
         text = (text or "").lower()
-        scores = {k:0 for k in ("time","meaning","reflection","gravity")}
-        for cat in scores:
-            for kw, val in self.weights.get(cat, {}).items():
-                scores[cat] += text.count(kw) * val
-        return scores
\ No newline at end of file
+        # Accumulate into a fixed slot per category; build the dict once.
+        totals = [0] * len(self.CATEGORIES)
+        if self._automaton is not None:
+            # The automaton reports overlapping hits; str.count doesn't. Skip a
+            # hit that starts inside the same keyword's previous match.
+            free_from = {}
+            for end, (kw, size, pairs) in self._automaton.iter(text):
+                start = end - size + 1
+                if start < free_from.get(kw, 0):
+                    continue
+                free_from[kw] = end + 1
+                for cat_idx, val in pairs:
+                    totals[cat_idx] += val
+        else:
+            if self._kw_bytes is not None:
+                count = text.encode("utf-8").count
+                kws = self._kw_bytes
+            else:
+                count = text.count
+                kws = self._kw
+            for kw, cat_idx, val in zip(kws, self._kw_cat, self._kw_val):
+                totals[cat_idx] += count(kw) * val
+        return dict(zip(self.CATEGORIES, totals))
\ No newline at end of file
@@ -1,88 +1,60 @@
 from pathlib import Path
+import functools
+import importlib
+import json
 import os
+import stat
+import sys
 import time
 
-from pathlib import Path
-import os
-
 BASE_DIR = Path(__file__).resolve().parent
 os.chdir(BASE_DIR)
-
-# --- Core directory layout ---
-META_DIR = BASE_DIR / "MetaDB"
-PERSONA_DIR = META_DIR / "Personality Cortext'x"
-PROFILE_DIR = META_DIR / "Profiles"
-
-# Ensure directories exist
-META_DIR.mkdir(exist_ok=True)
-PERSONA_DIR.mkdir(parents=True, exist_ok=True)
-PROFILE_DIR.mkdir(parents=True, exist_ok=True)
-import sys
-from pathlib import Path
-
-import sys
 sys.path.append("/home/aa/qtmos.com")
 
-
-import os
-import re
-import json
-import time
-import threading
-import logging
-import traceback
-import sys
-import urllib.request
-import urllib.error
-import html
-import urllib.parse
-import subprocess
-
-
-from collections import Counter
-from datetime import datetime
-from queue import Queue
-from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-
-
-import requests
-import os
-
-from cognition_math import V0Formula
-from emotionalbinary import EmotionalBinary
-from persona_db import PersonalityDB
-
-
-import os
-
-from pathlib import Path
-
-BASE_DIR = Path(__file__).resolve().parent
-META_DIR = BASE_DIR / "MetaDB"
-PERSONA_DIR = META_DIR / "Personality Cortext'x"
-PROFILE_DIR = META_DIR / "Profiles"
-from llm_adapters import GeminiAdapter
-from recursiveLearning import RecursiveLearning
-# --- Core memory paths ---
-CORE_PATH = META_DIR / "pack_core.json"
-
-# --- Episodic memory paths ---
-DEFAULT_EPI_PATH = PERSONA_DIR / "pack_empty.json"
-BASE_EMPTY_PACK = DEFAULT_EPI_PATH
-from synthesis import Synthesizer
-from tonesequencer import ToneSequencer
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# Heavy or optional modules are imported on first attribute access
+# (bootstrap.requests, bootstrap.GeminiAdapter, ...) rather than at start-up.
+_LAZY_IMPORTS = {
+    "requests": ("requests", None),
+    "subprocess": ("subprocess", None),
+    "V0Formula": ("cognition_math", "V0Formula"),
+    "EmotionalBinary": ("emotionalbinary", "EmotionalBinary"),
+    "PersonalityDB": ("persona_db", "PersonalityDB"),
+    "list_packs": ("persona_db", "list_packs"),
+    "GeminiAdapter": ("llm_adapters", "GeminiAdapter"),
+    "RecursiveLearning": ("recursiveLearning", "RecursiveLearning"),
+    "Synthesizer": ("synthesis", "Synthesizer"),
+    "ToneSequencer": ("tonesequencer", "ToneSequencer"),
+}
 
 
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = importlib.import_module(module_name)
+    if attr is not None:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
 
 
+def find_qtm_boot_script() -> Path | None:
+    # Resolved once per QTM_BOOT_PATH value; later calls are free.
+    return _find_qtm_boot_script(os.getenv("QTM_BOOT_PATH"))
 
 
-def find_qtm_boot_script() -> Path | None:
+@functools.lru_cache(maxsize=4)
+def _find_qtm_boot_script(env_path: str | None) -> Path | None:
     candidates: list[Path] = []
+    on_windows = sys.platform == "win32"
 
     # 1) Explicit environment override
-    env_path = os.getenv("QTM_BOOT_PATH")
     if env_path:
         candidates.append(Path(env_path))
 
@@ -90,7 +62,8 @@ def find_qtm_boot_script() -> Path | None:
     BASE_DIR = Path(__file__).resolve().parent
 
     # 3) Native Windows workspace path
-    candidates.append(Path(r"C:\Projects\Daves Desktop Buddies\QTMoS\qtmos_boot.py"))
+    if on_windows:
+        candidates.append(Path(r"C:\Projects\Daves Desktop Buddies\QTMoS\qtmos_boot.py"))
 
     # 4) WSL-native install (THIS WAS MISSING)
     candidates.append(
@@ -98,13 +71,15 @@ def find_qtm_boot_script() -> Path | None:
     )
 
     # 5) UNC (Windows-only, lowest priority)
-    candidates.append(
-        Path(r"\\wsl.localhost\Ubuntu\home\aa\qtmos.com\QTMoS\qtmos_boot.py")
-    )
+    if on_windows:
+        candidates.append(
+            Path(r"\\wsl.localhost\Ubuntu\home\aa\qtmos.com\QTMoS\qtmos_boot.py")
+        )
 
     for path in candidates:
         try:
-            if path.is_file():
+            # One stat per candidate (is_file() + resolve() would stat twice).
+            if stat.S_ISREG(os.stat(path).st_mode):
                 return path.resolve()
         except OSError:
             continue
@@ -115,7 +90,7 @@ def find_qtm_boot_script() -> Path | None:
 SAFE_MODE = False
 
 if SAFE_MODE:
-    import builtins, urllib, sys
+    import builtins, urllib.request, sys
 
     # Block web/network requests (this is fine)
     def _blocked_request(*a, **k):
@@ -152,10 +127,6 @@ def safe_exec(source, context=None):
         raise RuntimeError("[SECURITY]: exec() blocked outside of safe modules.")
 
 
-# --- Ensure working dir = script dir ---
-BASE_DIR = Path(__file__).resolve().parent
-os.chdir(BASE_DIR)
-
 # --- Optional Dwrapper stub/import ---
 try:
     sys.path.append(str(BASE_DIR / "Modular" / "Cognition"))
@@ -172,6 +143,7 @@ class C:
     @staticmethod
     def rgb(r,g,b): return f"\033[38;2;{r};{g};{b}m"
     @staticmethod
+    @functools.lru_cache(maxsize=64)
     def hex(h):
         try:
             h = h.strip("#")
@@ -189,9 +161,18 @@ ROLE = {
     "DWRAP":  C.hex("#FF9800"),
 }
 
+# One "<color>[ROLE]: %s<reset>" template per role; a print is a single %-format.
+_ROLE_TEMPLATES = {k: f"{color}[{k}]: %s{C.RESET}" for k, color in ROLE.items()}
+
+
+@functools.lru_cache(maxsize=16)
+def _role_template(role):
+    key = role.upper()
+    return _ROLE_TEMPLATES.get(key) or f"[{key}]: %s{C.RESET}"
+
+
 def color_print(role, message):
-    color = ROLE.get(role.upper(), "")
-    print(f"{color}[{role.upper()}]: {message}{C.RESET}")
+    print(_role_template(role) % (message,))
 
 
 
@@ -203,34 +184,53 @@ META_DIR = BASE_DIR / "MetaDB"
 PERSONA_DIR = META_DIR / "Personality Cortext'x"   # episodic & persona packs live here
 PROFILE_DIR = META_DIR / "Profiles"               # per-entity profiles (Willow, Caleb, Mem, etc.)
 
-META_DIR.mkdir(exist_ok=True)
-PERSONA_DIR.mkdir(parents=True, exist_ok=True)
-PROFILE_DIR.mkdir(parents=True, exist_ok=True)
-
 CORE_DIR = Path(os.getenv("QTMOS_CORE_DIR", META_DIR))
 CORE_FILE = os.getenv("QTMOS_CORE_FILE", "pack_core.json")
 CORE_PATH = CORE_DIR / CORE_FILE
 
 BASE_EMPTY_PACK = PERSONA_DIR / "pack_empty.json"
 
-# Ensure base empty episodic pack exists
-if not BASE_EMPTY_PACK.exists():
-    BASE_EMPTY_PACK.write_text(
-        json.dumps(
-            {
-                "learning_history": [],
-                "last_saved": time.time(),
-                "_meta": {
-                    "kind": "episodic",
-                    "name": "base_empty",
-                    "tags": ["empty", "reset"],
-                },
-            },
-            indent=2,
-            ensure_ascii=False,
-        ),
-        encoding="utf-8",
-    )
+_LAYOUT_READY = False
+
+
+def _write_empty_pack(path: Path):
+    """Create the base empty episodic pack unless it already exists."""
+    payload = {
+        "learning_history": [],
+        "last_saved": time.time(),
+        "_meta": {
+            "kind": "episodic",
+            "name": "base_empty",
+            "tags": ["empty", "reset"],
+        },
+    }
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+    # O_EXCL: create-or-skip in one call, no exists() check to race against.
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _ensure_layout():
+    """Create the MetaDB layout and base pack once per process."""
+    global _LAYOUT_READY
+    if _LAYOUT_READY:
+        return
+    PERSONA_DIR.mkdir(parents=True, exist_ok=True)  # also creates META_DIR
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    _write_empty_pack(BASE_EMPTY_PACK)
+    _LAYOUT_READY = True
+
+
+_ensure_layout()
 
 DEFAULT_EPI_PATH = BASE_EMPTY_PACK
 
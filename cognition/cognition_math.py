@@ -1,13 +1,26 @@
 # cognition_math.py
+from collections import Counter
+
+
 class V0Formula:
     def __init__(self, weights):
         self.weights = weights
+        # word -> ((category, value), ...) so each token is one dict lookup
+        # instead of one membership test per category.
+        index = {}
+        for cat, table in weights.items():
+            for w, val in table.items():
+                index.setdefault(w, []).append((cat, val))
+        self._index = {w: tuple(hits) for w, hits in index.items()}
+        self._keys = self._index.keys()
 
     def calculate(self, text: str) -> dict:
         scores = {k: 0 for k in self.weights}
-        words = text.lower().split()
-        for cat, table in self.weights.items():
-            for w in words:
-                if w in table:
-                    scores[cat] += table[w]
+        # Count tokens in C, then visit only distinct words that are weighted.
+        counts = Counter(text.lower().split())
+        index = self._index
+        for w in counts.keys() & self._keys:
+            n = counts[w]
+            for cat, val in index[w]:
+                scores[cat] += val * n
         return scores
@@ -1,25 +1,49 @@
 # emotionalbinary.py
 
+CATEGORIES = ("time", "meaning", "reflection", "gravity")
+
+# "0000".."1111", indexed by the packed 4-bit state.
+_BITS = tuple(format(i, "04b") for i in range(16))
+
+_NAMES = {
+    "1001": "Loyal Offering",
+    "0101": "Spark",
+    "0110": "Echo",
+    "0011": "Seed Sent",
+    "1111": "Superstate (G₀)",
+    "0010": "Fragile Mirror",
+    "1010": "One-Way Path",
+    "0111": "Weightless Push",
+    "0001": "Ghost",
+}
+
+# Name per packed state, so decoding a pack() result is one tuple index.
+_STATE_NAMES = tuple(_NAMES.get(b, "Unknown") for b in _BITS)
+_STATE_INDEX = {b: i for i, b in enumerate(_BITS)}
+
+
 class EmotionalBinary:
     def __init__(self, thresholds):
         self.thresholds = thresholds
+        self._t = tuple(thresholds.get(cat, 0) for cat in CATEGORIES)
 
-    def encode(self, scores):
-        return "".join(
-            "1" if scores.get(cat, 0) > self.thresholds.get(cat, 0) else "0"
-            for cat in ("time", "meaning", "reflection", "gravity")
+    def pack(self, scores) -> int:
+        """The 4-bit state (time, meaning, reflection, gravity) as 0..15."""
+        t0, t1, t2, t3 = self._t
+        get = scores.get
+        return (
+            (get("time", 0) > t0) << 3
+            | (get("meaning", 0) > t1) << 2
+            | (get("reflection", 0) > t2) << 1
+            | (get("gravity", 0) > t3)
         )
 
+    def encode(self, scores):
+        return _BITS[self.pack(scores)]
+
     def decode(self, bits):
-        mp = {
-            "1001": "Loyal Offering",
-            "0101": "Spark",
-            "0110": "Echo",
-            "0011": "Seed Sent",
-            "1111": "Superstate (G₀)",
-            "0010": "Fragile Mirror",
-            "1010": "One-Way Path",
-            "0111": "Weightless Push",
-            "0001": "Ghost",
-        }
-        return mp.get(bits, "Unknown")
+        """Name of a state given as a pack() int or its "0101" string."""
+        if isinstance(bits, int):
+            return _STATE_NAMES[bits] if 0 <= bits < 16 else "Unknown"
+        i = _STATE_INDEX.get(bits)
+        return "Unknown" if i is None else _STATE_NAMES[i]
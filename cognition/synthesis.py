@@ -5,17 +5,30 @@ from collections import Counter
 
 
 class Synthesizer:
+    # Words of 4+ characters; the length filter lives in the pattern.
+    _WORD_RE = re.compile(r"\w{4,}")
+
     def __init__(self, learning_system, formula, encoder):
         self.learning_system = learning_system
         self.formula = formula
         self.encoder = encoder
 
     def find_dominant_emotion(self):
-        with self.learning_system._lock:
-            all_mem = (
-                self.learning_system.core_learning_history +
-                self.learning_system.episodic_learning_history
-            )
+        ls = self.learning_system
+        if hasattr(ls, "_emotion_counts"):
+            # LearningSystem keeps the tallies current on every add.
+            with ls._lock:
+                counts = ls._emotion_counts
+                if not counts:
+                    return None, []
+                dom = counts.most_common(1)[0][0]
+                return dom, list(ls._by_emotion.get(dom, ()))
+
+        with ls._lock:
+            all_mem = [
+                *ls.core_learning_history,
+                *ls.episodic_learning_history,
+            ]
 
         if not all_mem:
             return None, []
@@ -37,10 +50,10 @@ class Synthesizer:
 
     def extract_keywords(self, texts):
         words = Counter()
+        update = words.update
+        findall = self._WORD_RE.findall
         for t in texts:
-            for w in re.findall(r"\b\w+\b", (t or "").lower()):
-                if len(w) > 3:
-                    words[w] += 1
+            update(findall((t or "").lower()))
         return words.most_common(5)
 
     def synthesize(self):
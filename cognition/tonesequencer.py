@@ -1,6 +1,14 @@
 # tonesequencer.py
 
+import csv
+import io
+import math
+import sys
+import threading
 import time
+import wave
+from array import array
+from functools import cached_property, lru_cache
 from pathlib import Path
 
 try:
@@ -9,70 +17,152 @@ except Exception:
     winsound = None
 
 
+_SKIP_PREFIXES = ("#", ";", "Code")
+_INT_MAX = 2 ** (8 * array("i").itemsize - 1) - 1
+
+
+def _to_int(value: str, default: int) -> int:
+    try:
+        n = int(value)
+    except Exception:
+        return default
+    # Out-of-range values would not fit the int column.
+    return n if -_INT_MAX <= n <= _INT_MAX else default
+
+
+SAMPLE_RATE = 22050
+_AMPLITUDE = 0.5 * 32767
+
+
+@lru_cache(maxsize=64)
+def _tone_samples(freq: int, dur_ms: int) -> array:
+    """16-bit mono sine samples for one tone (cached per freq/duration)."""
+    n = max(0, SAMPLE_RATE * dur_ms // 1000)
+    step = 2 * math.pi * freq / SAMPLE_RATE
+    return array("h", (int(_AMPLITUDE * math.sin(step * i)) for i in range(n)))
+
+
+def _play_wav(data: bytes):
+    try:
+        winsound.PlaySound(data, winsound.SND_MEMORY)
+    except Exception:
+        pass
+
+
 class ToneSequencer:
     def __init__(self, lexicon_file: str = "emotional_lexicon.txt"):
-        self.tones = {}
+        # Tones are stored column-wise; _codes maps a code to its row index.
+        self._codes: dict[str, int] = {}
+        self._pulse = array("i")
+        self._freq = array("i")
+        self._name: list[str] = []
+        self._color: list[str] = []
         self._load(Path(lexicon_file))
-        print(f"[VOICE]: Loaded {len(self.tones)} tones.")
+        print(f"[VOICE]: Loaded {len(self._codes)} tones.")
+
+    @cached_property
+    def tones(self) -> dict:
+        """Row view ({code: {pulse, freq, name, color}}) for older callers.
+
+        Built on first access; the table is fixed once the lexicon is loaded.
+        """
+        return {
+            code: {
+                "pulse": self._pulse[i],
+                "freq": self._freq[i],
+                "name": self._name[i],
+                "color": self._color[i],
+            }
+            for code, i in self._codes.items()
+        }
 
     def _load(self, path: Path):
         if not path.exists():
             return
 
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith(("#", ";", "Code")):
+        with path.open("r", encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                if not row or row[0].lstrip().startswith(_SKIP_PREFIXES):
                     continue
 
-                parts = [p.strip() for p in line.split(",")]
+                parts = [p.strip() for p in row]
                 if len(parts) < 4:
                     continue
 
                 code = parts[0].upper()
-                try:
-                    pulse = int(parts[1])
-                except Exception:
-                    pulse = 100
-
-                try:
-                    freq = int(parts[2])
-                except Exception:
-                    freq = 440
+                pulse = _to_int(parts[1], 100)
+                freq = _to_int(parts[2], 440)
 
                 name = parts[3]
                 color = parts[4] if len(parts) >= 5 else "#FFFFFF"
 
-                self.tones[code] = {
-                    "pulse": pulse,
-                    "freq": freq,
-                    "name": name,
-                    "color": color,
-                }
-
-    def play_sequence(self, codes, loops=1, rest=50):
+                idx = self._codes.get(code)
+                if idx is None:
+                    self._codes[code] = len(self._name)
+                    self._pulse.append(pulse)
+                    self._freq.append(freq)
+                    self._name.append(name)
+                    self._color.append(color)
+                else:
+                    # Later rows win, as with the old dict-per-code table.
+                    self._pulse[idx] = pulse
+                    self._freq[idx] = freq
+                    self._name[idx] = name
+                    self._color[idx] = color
+
+    def _build_wav(self, codes, loops=1, rest=50) -> bytes:
+        """Render the whole sequence (tones + inter-loop rests) as one WAV."""
+        lookup = self._codes.get
+        samples = array("h")
+        silence = array("h", bytes(2 * (SAMPLE_RATE * max(0, rest) // 1000)))
         for _ in range(loops):
             for code in codes:
-                tone = self.tones.get(code)
-                if not tone:
+                idx = lookup(code)
+                if idx is not None:
+                    samples.extend(_tone_samples(self._freq[idx], self._pulse[idx]))
+            samples.extend(silence)
+        if sys.byteorder == "big":
+            samples.byteswap()  # WAV PCM is little-endian
+
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(SAMPLE_RATE)
+            w.writeframes(samples.tobytes())
+        return buf.getvalue()
+
+    def play_sequence(self, codes, loops=1, rest=50, wait=True):
+        """Print and play each tone; wait=False returns while audio still plays."""
+        lookup = self._codes.get
+        for _ in range(loops):
+            for code in codes:
+                idx = lookup(code)
+                if idx is None:
                     print(f"[TONE] Unknown: {code}")
                     continue
 
-                freq = tone["freq"]
-                dur = tone["pulse"]
-                name = tone["name"]
+                freq = self._freq[idx]
+                dur = self._pulse[idx]
+                name = self._name[idx]
 
                 print(f"[TONE] {code}: {name} → {freq}Hz for {dur}ms")
 
-                if winsound:
-                    try:
-                        winsound.Beep(freq, dur)
-                    except Exception:
-                        pass
-                else:
+                if not winsound:
                     time.sleep(dur / 1000)
 
-            time.sleep(rest / 1000)
+            if not winsound:
+                time.sleep(rest / 1000)
+
+        if winsound:
+            # One PlaySound for the whole sequence instead of a blocking Beep
+            # per tone. SND_ASYNC cannot be combined with SND_MEMORY, so the
+            # non-blocking form plays on a daemon thread.
+            wav = self._build_wav(codes, loops=loops, rest=rest)
+            if wait:
+                _play_wav(wav)
+            else:
+                threading.Thread(target=_play_wav, args=(wav,), daemon=True).start()
 
     @staticmethod
     def load_lexicon(filepath="emotional_lexicon.txt"):
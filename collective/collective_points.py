@@ -1,10 +1,17 @@
-from dataclasses import dataclass
-from datetime import datetime
+import sys
+import time
+from dataclasses import dataclass, field
 
-@dataclass
+@dataclass(slots=True)
 class Point:
     model: str
     prompt_id: int
     content: str
     weight: float = 1.0
-    timestamp: datetime = datetime.utcnow()
+    # Creation time as a UTC epoch float, taken per instance.
+    timestamp: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        # A handful of model names repeat across every point; share one string each.
+        if type(self.model) is str:
+            self.model = sys.intern(self.model)
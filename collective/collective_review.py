@@ -1,13 +1,11 @@
 # collective_review.py
 
+from itertools import chain
 from typing import List
 from collective.collective_points import Point
 
 def merge_points(*point_lists: List[Point]) -> List[Point]:
-    merged = []
-    for plist in point_lists:
-        merged.extend(plist)
-    return merged
+    return list(chain.from_iterable(point_lists))
 
 
 def reinforce_points(points: List[Point]) -> List[Point]:
@@ -16,10 +16,12 @@ Run:
 Optional env:
   BRIDGE_TICK_SECONDS=1.5
   BRIDGE_LOG_PATH=<path>
+  BRIDGE_SUBPROC=1   (run each command as `main.py --once` instead of in-process)
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import subprocess
@@ -30,6 +32,11 @@ from datetime import datetime
 from pathlib import Path
 from queue import Queue, Empty
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 CORE_DIR = Path(__file__).resolve().parent
 CORE_MAIN = CORE_DIR / "main.py"
 PROJECT_ROOT = CORE_DIR.parent
@@ -37,20 +44,59 @@ DEFAULT_LOG = PROJECT_ROOT / "runtime" / "bridge" / "clawbus.jsonl"
 
 TICK = float(os.getenv("BRIDGE_TICK_SECONDS", "1.5"))
 LOG_PATH = Path(os.getenv("BRIDGE_LOG_PATH", str(DEFAULT_LOG)))
+SUBPROC = os.getenv("BRIDGE_SUBPROC", "0") == "1"
+
+if not SUBPROC:
+    # Import the core once and dispatch in-process: no interpreter start-up
+    # or import graph reload per tick/command.
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from core.main import dispatch, get_system
 
 
 def now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
+# The event log is opened once and written through a buffer; it is flushed
+# every EMIT_FLUSH_EVERY events, once per bridge loop iteration, and at exit.
+EMIT_FLUSH_EVERY = 32
+_log_fh = None
+_log_pending = 0
+
+
+def _open_log():
+    global _log_fh
+    if _log_fh is None:
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _log_fh = LOG_PATH.open("ab", buffering=1 << 16)
+        atexit.register(_log_fh.close)
+    return _log_fh
+
+
+def flush_events():
+    global _log_pending
+    if _log_fh is not None and _log_pending:
+        _log_fh.flush()
+        _log_pending = 0
+
+
 def emit(event: dict):
+    global _log_pending
     event = {"ts": now_iso(), **event}
-    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with LOG_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    if orjson is not None:
+        line = orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+    _open_log().write(line)
+    _log_pending += 1
+    if _log_pending >= EMIT_FLUSH_EVERY:
+        flush_events()
 
 
 def run_once(command: str) -> tuple[int, str, str]:
+    if not SUBPROC:
+        return dispatch(command)
     proc = subprocess.run(
         [sys.executable, str(CORE_MAIN), "--once", command],
         cwd=str(CORE_DIR),
@@ -61,8 +107,13 @@ def run_once(command: str) -> tuple[int, str, str]:
 
 
 def try_json(text: str):
+    # Most core output is plain text; skip the decoder (and the exception it
+    # would raise) unless the payload can start a JSON object/array/string.
+    s = (text or "").lstrip()
+    if not s or s[0] not in "{[\"":
+        return None
     try:
-        return json.loads(text)
+        return orjson.loads(s) if orjson is not None else json.loads(s)
     except Exception:
         return None
 
@@ -73,6 +124,17 @@ class Bridge:
         self.inferstructured = False
         self.input_q: Queue[str] = Queue()
         self.last_status = {}
+        self._handlers = {
+            "/quit": self._h_quit,
+            "quit": self._h_quit,
+            "exit": self._h_quit,
+            "/help": self._h_help,
+            "help": self._h_help,
+            "?": self._h_help,
+            "/status": self._h_status,
+            "/map": self._h_map,
+        }
+        self._ci_handlers = {"live": self._h_live}
 
     def start(self):
         emit({"kind": "bridge.start", "core": str(CORE_MAIN)})
@@ -86,9 +148,11 @@ class Bridge:
         while self.running:
             self._tick()
             self._drain_input()
+            flush_events()
             time.sleep(TICK)
 
         emit({"kind": "bridge.stop"})
+        flush_events()
         print("[BRIDGE] shutdown")
 
     def _input_loop(self):
@@ -110,39 +174,15 @@ class Bridge:
             if not line:
                 continue
 
-            if line in ("/quit", "quit", "exit"):
-                self.running = False
-                return
-
-            if line in ("/help", "help", "?"):
-                print("[BRIDGE HELP] /infer on|off, /status, /map, /quit")
-                print("[BRIDGE HELP] pass core commands like: state, claw status --json, pack-list epi")
-                continue
-
-            if line.lower() == "live":
-                self.inferstructured = True
-                emit({"kind": "infer.mode", "enabled": True, "alias": "live"})
-                print("[INFERSTRUCTURED] ON (alias: live)")
+            # Exact-match control commands; "live" also matches any case.
+            handler = self._handlers.get(line) or self._ci_handlers.get(line.lower())
+            if handler is not None:
+                if handler():
+                    return
                 continue
 
             if line.startswith("/infer"):
-                parts = line.split()
-                if len(parts) >= 2 and parts[1].lower() in ("on", "off"):
-                    self.inferstructured = parts[1].lower() == "on"
-                    emit({"kind": "infer.mode", "enabled": self.inferstructured})
-                    print(f"[INFERSTRUCTURED] {'ON' if self.inferstructured else 'OFF'}")
-                else:
-                    print("usage: /infer on|off")
-                continue
-
-            if line == "/status":
-                self._status_snapshot(print_out=True)
-                continue
-
-            if line == "/map":
-                rc, out, err = run_once("claw map --json")
-                emit({"kind": "map", "rc": rc, "stdout": out, "stderr": err})
-                print(out if out else f"[ERR] rc={rc} {err}")
+                self._h_infer(line)
                 continue
 
             # prevent shell confusion inside bridge prompt
@@ -161,9 +201,46 @@ class Bridge:
             else:
                 print(f"[OK] rc={rc}")
 
+    # Control handlers: return True to stop draining input.
+
+    def _h_quit(self):
+        self.running = False
+        return True
+
+    def _h_help(self):
+        print("[BRIDGE HELP] /infer on|off, /status, /map, /quit")
+        print("[BRIDGE HELP] pass core commands like: state, claw status --json, pack-list epi")
+
+    def _h_live(self):
+        self.inferstructured = True
+        emit({"kind": "infer.mode", "enabled": True, "alias": "live"})
+        print("[INFERSTRUCTURED] ON (alias: live)")
+
+    def _h_status(self):
+        self._status_snapshot(print_out=True)
+
+    def _h_map(self):
+        rc, out, err = run_once("claw map --json")
+        emit({"kind": "map", "rc": rc, "stdout": out, "stderr": err})
+        print(out if out else f"[ERR] rc={rc} {err}")
+
+    def _h_infer(self, line: str):
+        parts = line.split()
+        if len(parts) >= 2 and parts[1].lower() in ("on", "off"):
+            self.inferstructured = parts[1].lower() == "on"
+            emit({"kind": "infer.mode", "enabled": self.inferstructured})
+            print(f"[INFERSTRUCTURED] {'ON' if self.inferstructured else 'OFF'}")
+        else:
+            print("usage: /infer on|off")
+
     def _status_snapshot(self, print_out=False):
-        rc, out, err = run_once("claw status --json")
-        data = try_json(out) if out else None
+        if not SUBPROC:
+            # Read live state directly: no command parsing or JSON round trip.
+            rc, out, err = 0, "", ""
+            data = get_system().status_snapshot()
+        else:
+            rc, out, err = run_once("claw status --json")
+            data = try_json(out) if out else None
         if data:
             self.last_status = data
             emit({"kind": "status", "data": data})
@@ -185,8 +262,12 @@ class Bridge:
 
         self._status_snapshot(print_out=True)
 
-        rc, out, err = run_once("claw memory epi 2 --json")
-        data = try_json(out) if out else None
+        if not SUBPROC:
+            rc, out, err = 0, "", ""
+            data = {"tail": {"items": get_system().epi_tail(2)}}
+        else:
+            rc, out, err = run_once("claw memory epi 2 --json")
+            data = try_json(out) if out else None
         if data and isinstance(data, dict):
             tail = (((data.get("tail") or {}).get("items")) or [])
             preview = (tail[-1][:120] + "…") if tail and len(tail[-1]) > 120 else (tail[-1] if tail else "")
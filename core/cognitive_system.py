@@ -1,24 +1,243 @@
 import os
+import atexit
 import json
 import logging
 import threading
+import queue
+import re
 import subprocess
 import sys
 import time
 import shlex
 import hashlib
+import functools
+import importlib.util
 import urllib.parse
 import webbrowser
+from collections import Counter, defaultdict
 from pathlib import Path
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover
+    ijson = None  # type: ignore
+
+
+def _dumps_pretty(obj) -> str:
+    """Indented JSON text for --json output (orjson when available)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode("utf-8")
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; the stdlib copes
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+
+
+# Packs larger than this are streamed item by item (when ijson is available)
+# instead of being parsed as one document.
+STREAM_LOAD_BYTES = int(os.getenv("QTMOS_STREAM_LOAD_BYTES", str(8 * 1024 * 1024)))
+
+# Journaled inserts are folded back into the canonical pack after this many.
+COMPACT_EVERY = int(os.getenv("QTMOS_COMPACT_EVERY", "200"))
+
+# Characters that make shlex.split differ from str.split.
+_SHLEX_SPECIAL = frozenset("\"'\\")
+
+def _strip_ws(value) -> str:
+    """value as a str with all whitespace removed (pasted tokens wrap and pad)."""
+    # split/join beats str.translate here: both are one C pass, and split's
+    # whitespace set is the full Unicode one.
+    return "".join(str(value or "").split())
+
+
+# ASCII profile-name sanitizer: alphanumerics kept, everything else -> "_".
+_SAFE_NAME_TABLE = {i: (chr(i) if chr(i).isalnum() else "_") for i in range(128)}
+
+_ENV_FILE_CACHE: dict[str, tuple[int, dict[str, str]]] = {}
+
+# KEY=value, KEY="value" or KEY='value'; a " #..." tail is a comment.
+_ENV_LINE = re.compile(
+    r"""^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(?:"([^"]*)"|'([^']*)'|(.*?))(?:\s+#.*)?\s*$"""
+)
+
+
+def _load_env_file(path) -> dict[str, str]:
+    """KEY=value pairs of an env file (first assignment wins), cached by mtime.
+
+    Callers get the shared dict and must not mutate it. Missing or unreadable
+    files read as empty.
+    """
+    key = os.fspath(path)
+    try:
+        mtime = os.stat(key).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _ENV_FILE_CACHE.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    parsed: dict[str, str] = {}
+    try:
+        with open(key, "r", encoding="utf-8") as f:
+            for raw in f:
+                m = _ENV_LINE.match(raw)
+                if m and m.group(1) not in parsed:
+                    parsed[m.group(1)] = m.group(2) or m.group(3) or m.group(4) or ""
+    except Exception:
+        return {}
+    _ENV_FILE_CACHE[key] = (mtime, parsed)
+    return parsed
+
+
+def _child_env(env_file) -> dict[str, str] | None:
+    """Environment for a child process: os.environ plus env-file keys it lacks.
+
+    Returns None (inherit as-is) when the file adds nothing, which skips
+    copying the whole environment on every launch.
+    """
+    extra = _load_env_file(env_file) if env_file else {}
+    missing = [k for k in extra if k not in os.environ]
+    if not missing:
+        return None
+    env = os.environ.copy()
+    for k in missing:
+        env[k] = extra[k]
+    return env
+
+
+def _legacy_env_file() -> str | None:
+    """QTM_LEGACY_ENV_FILE, else <project_root>/llm/.env when it exists."""
+    env_file = os.getenv("QTM_LEGACY_ENV_FILE")
+    if not env_file:
+        cand = (PROJECT_ROOT / "llm" / ".env")
+        if cand.exists():
+            env_file = str(cand)
+    return env_file
+
+
+_NUMPY_OK = False
+
+
+def _numpy_available() -> bool:
+    """Whether numpy is importable by sys.executable (what qtmos_boot.py runs on).
+
+    A spec lookup in this process instead of spawning `python -c "import numpy"`;
+    only a hit is remembered, so a mid-session pip install is picked up.
+    """
+    global _NUMPY_OK
+    if not _NUMPY_OK:
+        importlib.invalidate_caches()
+        _NUMPY_OK = importlib.util.find_spec("numpy") is not None
+    return _NUMPY_OK
+
+
+# URL parameters that may carry a pasted Puter auth token, in priority order.
+_PUTER_TOKEN_KEYS = ("puterAuthToken", "token", "authToken")
+
+
+def _first_token_param(qs: str) -> str | None:
+    """First _PUTER_TOKEN_KEYS value in a query string, whitespace stripped."""
+    if not qs:
+        return None
+    params = urllib.parse.parse_qs(qs)
+    for key in _PUTER_TOKEN_KEYS:
+        if params.get(key):
+            return _strip_ws(urllib.parse.unquote(str(params[key][0])))
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _token_sha256(token: str) -> str:
+    return hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=4)
+def _find_qtmos_boot_cached(env_path: str | None) -> Path | None:
+    if env_path:
+        p = Path(env_path)
+        if p.is_file():
+            return p.resolve()
+
+    # Walk up a few parents and look for QTMoS/qtmos_boot.py
+    cur = PROJECT_ROOT
+    for _ in range(8):
+        p = cur / "QTMoS" / "qtmos_boot.py"
+        try:
+            if p.is_file():
+                return p.resolve()
+        except OSError:
+            pass
+        if cur.parent == cur:
+            break
+        cur = cur.parent
+
+    return None
+
+
+# Short-lived helper processes skip the close-all-fds pass on POSIX, which also
+# lets subprocess use posix_spawn. Fds Python opens are non-inheritable (PEP 446),
+# so nothing extra leaks; long-lived launches and the V3 worker keep the default.
+_SPAWN_CLOSE_FDS = os.name != "posix"
+
+
+@functools.lru_cache(maxsize=1)
+def _autodetect_legacy_py(home: str) -> str | None:
+    """First known legacy venv python that can import google-genai."""
+
+    def _py_supports_google_genai(py_path: str) -> bool:
+        try:
+            r0 = subprocess.run(
+                [py_path, "-c", "from google import genai"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=5,
+                close_fds=_SPAWN_CLOSE_FDS,
+            )
+            return r0.returncode == 0
+        except Exception:
+            return False
+
+    candidates = [
+        str(Path(home) / "qtmos-venv" / "bin" / "python"),
+        str(Path(home) / ".venvs" / "qtmos-v3" / "bin" / "python"),
+    ]
+    for c in candidates:
+        if os.path.exists(c) and _py_supports_google_genai(c):
+            return c
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _script_exists(path: Path) -> bool:
+    return path.exists()
+
+
+def _script_present(path: Path) -> bool:
+    """path.exists() for launch targets, remembered once the file is found."""
+    if _script_exists(path):
+        return True
+    # Only hits are remembered; a missing script is re-checked next time.
+    _script_exists.cache_clear()
+    return False
+
+
+# How long a /health probe of the MCP server is trusted, in seconds.
+MCP_HEALTH_TTL = float(os.getenv("QTMOS_MCP_HEALTH_TTL", "30"))
+
 from llm.llm_adapters import (
     chat_ollama,
     query_ollama,
+    query_ollama_stream,
     OLLAMA_MODELS,
     ask_router,
     GeminiAdapter,
     call_mcp_chat,
     call_mcp_gemini,
+    mcp_health,
     call_puter_with_model,
     has_puter_auth,
     list_puter_models,
@@ -43,6 +262,19 @@ except Exception:  # pragma: no cover
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 LEGACY_V3_PATH = (PROJECT_ROOT.parent / "CognitiveSystems_V3.py").resolve()
 LLM_ENV_PATH = PROJECT_ROOT / "llm" / ".env"
+LIVE_BRIDGE_PATH = PROJECT_ROOT / "core" / "claw_live_bridge.py"
+
+# `wslmenu dirs` listing, resolved once.
+WSL_QUICK_DIRS = (
+    str(Path("~").expanduser()),
+    str((Path("~") / "my-quantum-env").expanduser()),
+    str((Path("~") / "qiskit-aer").expanduser()),
+    str((Path("~") / "qubit-venv").expanduser()),
+    str((Path("~") / "quantum310").expanduser()),
+    "/mnt/c/Projects",
+    "/mnt/c/Projects/Daves Desktop Buddies/Head/Tenchin",
+    str(PROJECT_ROOT),
+)
 
 # MetaDB resolution order:
 # 1) explicit override (QTMOS_META_DIR)
@@ -65,6 +297,9 @@ else:
 PERSONA_DIR = META_DIR / "Personality Cortext'x"
 CORE_PATH = META_DIR / "pack_core.json"
 DEFAULT_EPI_PATH = PERSONA_DIR / "pack_empty.json"
+# str forms, computed once; LearningSystem and os.* work on plain strings.
+CORE_PATH_STR = os.fspath(CORE_PATH)
+DEFAULT_EPI_PATH_STR = os.fspath(DEFAULT_EPI_PATH)
 
 
 # =========================
@@ -77,61 +312,460 @@ class LearningSystem:
     Supports two on-disk formats seen in this repo:
     - list[dict] (legacy)
     - {"learning_history": list[dict], "last_saved": ...} (current)
+
+    New records are appended to a <pack>.jsonl journal next to each pack and
+    folded into the pack by compact() (every COMPACT_EVERY inserts and at exit).
+    Journal writes happen on a background writer thread, so inserts only touch
+    memory; a crash can lose the batch still queued (call flush() to wait).
     """
 
     def __init__(self, core_file: str, epi_file: str):
-        self.core_file = core_file
-        self.epi_file = epi_file
+        self.core_file = os.fspath(core_file)
+        self.epi_file = os.fspath(epi_file)
+        # Directories already created by this instance; skips repeat makedirs.
+        self._made_dirs: set[str] = set()
         self.core_learning_history: list[dict] = []
         self.episodic_learning_history: list[dict] = []
-        self._lock = threading.Lock()
+        # Casefolded episodic inputs, parallel to episodic_learning_history.
+        self._epi_lower: list[str] = []
+        # Live emotional_state tallies over core + episodic, for the synthesizer.
+        self._emotion_counts: Counter = Counter()
+        self._by_emotion: defaultdict = defaultdict(list)
+        # _mem_lock guards the in-memory histories and is only held briefly;
+        # _io_lock serializes disk writes so they never block appends.
+        # _lock is the historical name other readers (Synthesizer) use.
+        self._mem_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._lock = self._mem_lock
+        self._journaled = 0
+        # Each queued (gen, path, record) was appended in memory at that
+        # compaction generation. _folded maps a pack path to the generation
+        # its last snapshot was taken at; a record for that path from an older
+        # generation is already in the pack and is dropped by the writer.
+        # Records for a pack swapped out before its snapshot are kept.
+        self._gen = 0
+        self._folded: dict[str, int] = {}
+        self._write_q: queue.Queue = queue.Queue()
         self.load_memory()
+        threading.Thread(target=self._writer_loop, name="learning-writer", daemon=True).start()
+        atexit.register(self.compact)
+
+    @staticmethod
+    def _stream_history(path: str) -> list[dict]:
+        with open(path, "rb") as f:
+            # Peek the top-level container to pick the item prefix.
+            head = f.read(64).lstrip()
+            f.seek(0)
+            prefix = "item" if head.startswith(b"[") else "learning_history.item"
+            return list(ijson.items(f, prefix, use_float=True))
 
     def _load_history(self, path: str) -> list[dict]:
         if not os.path.exists(path):
             return []
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if ijson is not None and os.path.getsize(path) > STREAM_LOAD_BYTES:
+            return self._stream_history(path)
+        if orjson is not None:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
         if isinstance(data, list):
             return data
         if isinstance(data, dict) and isinstance(data.get("learning_history"), list):
             return data["learning_history"]
         return []
 
+    def _ensure_dir(self, path: str):
+        d = os.path.dirname(path)
+        if d not in self._made_dirs:
+            os.makedirs(d, exist_ok=True)
+            self._made_dirs.add(d)
+
+    @staticmethod
+    def _journal_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".jsonl"
+
+    def _load_journal(self, path: str) -> list[dict]:
+        jpath = self._journal_path(path)
+        if not os.path.exists(jpath):
+            return []
+        loads = orjson.loads if orjson is not None else json.loads
+        records = []
+        with open(jpath, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(loads(line))
+                except ValueError:
+                    # A torn final line from an interrupted append.
+                    break
+        return records
+
+    def _append_journal(self, path: str, records: list[dict]):
+        self._ensure_dir(path)
+        if orjson is not None:
+            lines = [orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in records]
+        else:
+            lines = [(json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8") for r in records]
+        with open(self._journal_path(path), "ab") as f:
+            f.write(b"".join(lines))
+
+    def _drop_journal(self, path: str):
+        try:
+            os.remove(self._journal_path(path))
+        except FileNotFoundError:
+            pass
+
     def _save_history(self, path: str, history: list[dict]):
-        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._ensure_dir(path)
         payload = {
             "learning_history": history,
             "last_saved": __import__("time").time(),
         }
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
+        if orjson is not None:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        else:
+            data = json.dumps(payload, indent=2).encode("utf-8")
+        # Write beside the pack and swap it in: a crash leaves either the old
+        # pack (journal still replayable) or the new one, never a torn file.
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _lower_input(record) -> str:
+        if not isinstance(record, dict):
+            return ""
+        return str(record.get("input", "")).casefold()
+
+    def _reindex_episodic(self):
+        self._epi_lower = [self._lower_input(m) for m in self.episodic_learning_history]
+
+    def _count_emotion(self, record):
+        if not isinstance(record, dict):
+            return
+        state = record.get("emotional_state", {})
+        # Counted under the defaulted name, grouped under the raw one.
+        self._emotion_counts[state.get("name", "Unknown")] += 1
+        self._by_emotion[state.get("name")].append(record.get("input", ""))
+
+    def _reindex_emotions(self):
+        self._emotion_counts = Counter()
+        self._by_emotion = defaultdict(list)
+        for m in self.core_learning_history:
+            self._count_emotion(m)
+        for m in self.episodic_learning_history:
+            self._count_emotion(m)
+
+    @staticmethod
+    def _intern_record(record):
+        # Streamed and per-line decodes give every record its own key strings;
+        # share them (and the few emotion names) across the whole history.
+        if not isinstance(record, dict):
+            return record
+        out = {sys.intern(k): v for k, v in record.items()}
+        state = out.get("emotional_state")
+        if isinstance(state, dict) and isinstance(state.get("name"), str):
+            state["name"] = sys.intern(state["name"])
+        return out
+
+    def _load_pack(self, path: str) -> tuple[list[dict], int]:
+        """Pack plus any journal tail, and how many journal lines there were."""
+        tail = self._load_journal(path)
+        history = [self._intern_record(m) for m in self._load_history(path)]
+        history.extend(self._intern_record(m) for m in tail)
+        return history, len(tail)
 
     def load_memory(self):
-        self.core_learning_history = self._load_history(self.core_file)
-        self.episodic_learning_history = self._load_history(self.epi_file)
+        self.core_learning_history, core_tail = self._load_pack(self.core_file)
+        self.episodic_learning_history, epi_tail = self._load_pack(self.epi_file)
+        # Leftover journal lines (e.g. from a crash) count toward compaction.
+        self._journaled = core_tail + epi_tail
+        self._reindex_episodic()
+        self._reindex_emotions()
 
     def save_memory(self):
-        self._save_history(self.core_file, self.core_learning_history)
-        self._save_history(self.epi_file, self.episodic_learning_history)
+        with self._io_lock:
+            # Snapshot under the memory lock, then write without it.
+            with self._mem_lock:
+                core_file, core = self.core_file, list(self.core_learning_history)
+                epi_file, epi = self.epi_file, list(self.episodic_learning_history)
+                self._gen += 1
+                self._folded[core_file] = self._folded[epi_file] = self._gen
+            self._save_history(core_file, core)
+            self._drop_journal(core_file)
+            self._save_history(epi_file, epi)
+            self._drop_journal(epi_file)
+            self._journaled = 0
+
+    def flush(self):
+        """Block until every queued insert has been journaled."""
+        self._write_q.join()
+
+    def compact(self):
+        """Fold journaled inserts into the canonical packs."""
+        self.flush()
+        if self._journaled:
+            self.save_memory()
+
+    def _writer_loop(self):
+        q = self._write_q
+        while True:
+            batch = [q.get()]
+            try:
+                while True:
+                    batch.append(q.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                self._write_batch(batch)
+            except Exception:
+                logging.error("LearningSystem journal write failed", exc_info=True)
+            finally:
+                for _ in batch:
+                    q.task_done()
+
+    def _write_batch(self, batch):
+        with self._io_lock:
+            by_path: dict[str, list[dict]] = {}
+            folded = self._folded
+            for gen, path, record in batch:
+                if gen >= folded.get(path, 0):
+                    by_path.setdefault(path, []).append(record)
+            for path, records in by_path.items():
+                self._append_journal(path, records)
+                self._journaled += len(records)
+            due = self._journaled >= COMPACT_EVERY
+        if due:
+            self.save_memory()
+
+    # Swapping one pack reloads only that pack; the other stays in memory.
 
     def set_core_file(self, path: str):
-        self.core_file = path
-        self.load_memory()
+        self.flush()
+        path = os.fspath(path)
+        history, tail = self._load_pack(path)
+        with self._mem_lock:
+            self.core_file = path
+            self.core_learning_history = history
+            self._journaled += tail
+            self._reindex_emotions()
 
     def set_epi_file(self, path: str):
-        self.epi_file = path
-        self.load_memory()
+        self.flush()
+        path = os.fspath(path)
+        history, tail = self._load_pack(path)
+        with self._mem_lock:
+            self.epi_file = path
+            self.episodic_learning_history = history
+            self._journaled += tail
+            self._reindex_episodic()
+            self._reindex_emotions()
 
     def add_episodic(self, text: str):
-        with self._lock:
-            self.episodic_learning_history.append({"input": text})
-            self.save_memory()
+        with self._mem_lock:
+            record = {"input": text}
+            self.episodic_learning_history.append(record)
+            self._epi_lower.append(text.casefold())
+            self._count_emotion(record)
+            self._write_q.put((self._gen, self.epi_file, record))
 
     def promote_to_core(self, text: str):
+        with self._mem_lock:
+            record = {"input": text}
+            self.core_learning_history.append(record)
+            self._count_emotion(record)
+            self._write_q.put((self._gen, self.core_file, record))
+
+    def find_episodic(self, term: str) -> list[tuple[int, dict]]:
+        """Return (1-based index, record) for episodic inputs containing term (caseless)."""
+        t = (term or "").casefold()
+        hist = self.episodic_learning_history
+        return [(i, hist[i - 1]) for i, low in enumerate(self._epi_lower, 1) if t in low]
+
+
+# =========================
+# LEGACY V3 WORKER
+# =========================
+
+# Subcommands that print usage for `claw` / `legacy`.
+_HELP_ARGS = frozenset(("help", "-h", "--help"))
+
+# Where `wslmenu envs` looks for venvs, relative to ~.
+_VENV_GLOBS = ("*/bin/activate", ".venvs/*/bin/activate", "venvs/*/bin/activate", ".virtualenvs/*/bin/activate")
+
+# Process names `wslmenu servers` picks out of `ps aux`.
+_SERVER_PROC_RE = re.compile(r"ollama|python|jupyter|code|node|gunicorn")
+
+# V3 shim commands that are forwarded verbatim to CognitiveSystems_V3.py.
+_LEGACY_DELEGATED = frozenset(
+    ("qtm-mode", "rails", "qhace", "forget", "duel", "ingest-url", "ingest-api", "crawl", "genesis-review")
+)
+
+# V3 shim commands share one long-lived CognitiveSystems_V3.py process.
+LEGACY_WORKER = os.getenv("QTM_LEGACY_WORKER", "1") == "1"
+
+
+class _LegacyWorker:
+    """A persistent CognitiveSystems_V3.py REPL driven over stdin.
+
+    Each command is followed by a sentinel line that V3 rejects with
+    "[UNKNOWN COMMAND]: '<sentinel>'"; seeing that echo ends the command's
+    output. The process is restarted when the interpreter or environment
+    changes, after a timeout, or if it exits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._proc = None
+        self._key = None
+        self._out = None
+        self._err = None
+        self._pumps = ()
+        self._seq = 0
+
+    def _start(self, argv: list[str], env: dict, key):
+        proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=str(LEGACY_V3_PATH.parent),
+            # Piped stdout is block-buffered otherwise; the sentinel would never arrive.
+            env=dict(env, PYTHONUNBUFFERED="1"),
+        )
+        out: queue.Queue = queue.Queue()
+        err: queue.Queue = queue.Queue()
+
+        def pump(stream, q):
+            for line in stream:
+                q.put(line)
+            q.put(None)
+
+        pumps = (
+            threading.Thread(target=pump, args=(proc.stdout, out), name="legacy-v3-out", daemon=True),
+            threading.Thread(target=pump, args=(proc.stderr, err), name="legacy-v3-err", daemon=True),
+        )
+        for t in pumps:
+            t.start()
+        self._proc, self._key, self._out, self._err = proc, key, out, err
+        self._pumps = pumps
+
+    def _drain_err(self) -> str:
+        chunks = []
+        while True:
+            try:
+                line = self._err.get_nowait()
+            except queue.Empty:
+                break
+            if line is not None:
+                chunks.append(line)
+        return "".join(chunks)
+
+    def run(self, argv: list[str], env: dict, command: str, timeout: float):
+        """(ok, stdout, stderr, returncode) for one command, like a one-shot run.
+
+        Raises OSError when the interpreter cannot be started.
+        """
+        return self.run_many(argv, env, [command], timeout)[0]
+
+    def run_many(self, argv: list[str], env: dict, commands: list[str], timeout: float) -> list[tuple]:
+        """Pipeline several commands in one write; one result tuple per command.
+
+        timeout applies to each command. If V3 stops part-way, the commands
+        after that point are reported as not run.
+        """
+        key = (tuple(argv), frozenset(env.items()))
         with self._lock:
-            self.core_learning_history.append({"input": text})
-            self.save_memory()
+            if self._proc is None or self._proc.poll() is not None or self._key != key:
+                self._close_locked()
+                self._start(argv, env, key)
+            self._drain_err()
+            marks = []
+            for _ in commands:
+                self._seq += 1
+                marks.append(f"__qtm_end_{os.getpid()}_{self._seq}__")
+            try:
+                self._proc.stdin.write("".join(f"{c}\n{m}\n" for c, m in zip(commands, marks)))
+                self._proc.stdin.flush()
+            except OSError as e:
+                self._close_locked()
+                return [(False, "", str(e), 1)] * len(commands)
+
+            results = []
+            for mark in marks:
+                result = self._read_until(mark, timeout)
+                results.append(result)
+                if self._proc is None:
+                    break
+            skipped = (False, "", "not run: legacy worker stopped", 1)
+            return results + [skipped] * (len(commands) - len(results))
+
+    def _read_until(self, mark: str, timeout: float):
+        lines = []
+        # Runs once per V3 output line: keep the lookups local.
+        get, monotonic, append = self._out.get, time.monotonic, lines.append
+        deadline = monotonic() + timeout
+        while True:
+            try:
+                line = get(timeout=max(0.0, deadline - monotonic()))
+            except queue.Empty:
+                self._close_locked()
+                return False, "".join(lines), "timeout running legacy command", 124
+            if line is None:
+                # V3 exited mid-command (e.g. it consumed the sentinel as input).
+                rc = self._proc.wait()
+                err = self._drain_err()
+                self._close_locked()
+                return rc == 0, "".join(lines), err, rc
+            if mark in line:
+                return True, "".join(lines), self._drain_err(), 0
+            append(line)
+
+    def _close_locked(self):
+        proc, self._proc = self._proc, None
+        pumps, self._pumps = self._pumps, ()
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()  # EOF: V3's input() loop exits on its own
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+            try:
+                proc.wait(timeout=2)
+            except Exception:
+                pass
+        # Once V3 is reaped the pumps hit EOF; then release the pipe fds.
+        for t in pumps:
+            t.join(timeout=2)
+        for stream in (proc.stdin, proc.stdout, proc.stderr):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+
+_LEGACY_WORKER = _LegacyWorker()
+atexit.register(_LEGACY_WORKER.close)
 
 
 # =========================
@@ -139,10 +773,21 @@ class LearningSystem:
 # =========================
 
 class CognitiveSystem:
+    # Fixed set of seven instance attributes: no per-instance __dict__.
+    __slots__ = (
+        "learning",
+        "preferred_llm",
+        "gemini",
+        "synthesizer",
+        "reflection_logger",
+        "_pulse",
+        "_mcp_health_cache",
+    )
+
     def __init__(self):
         self.learning = LearningSystem(
-            core_file=str(CORE_PATH),
-            epi_file=str(DEFAULT_EPI_PATH),
+            core_file=CORE_PATH_STR,
+            epi_file=DEFAULT_EPI_PATH_STR,
         )
 
         self.preferred_llm = "auto"
@@ -168,6 +813,7 @@ class CognitiveSystem:
         self.reflection_logger = None
 
         self._pulse = None
+        self._mcp_health_cache = None  # (monotonic ts, health dict or None)
 
     # =========================
     # COMMANDS (implemented)
@@ -189,8 +835,20 @@ class CognitiveSystem:
             print("[OLLAMA]: Adapter unavailable.")
             return
         model = OLLAMA_MODELS.get("default", "llama3.3:70b")
-        reply = chat_ollama([{"role": "user", "content": text}], model=model)
-        print(f"[OLLAMA:{model}]: {reply}")
+        # Print tokens as they arrive instead of waiting for the full reply.
+        started = False
+        try:
+            for chunk in query_ollama_stream(text, model=model):
+                if not started:
+                    print(f"[OLLAMA:{model}]: ", end="", flush=True)
+                    started = True
+                print(chunk, end="", flush=True)
+        except Exception:
+            pass
+        if started:
+            print()
+        else:
+            print(f"[OLLAMA:{model}]: None")
 
     def command_gemini(self, text: str):
         """Gemini via local MCP server (explicit user intent)."""
@@ -212,17 +870,9 @@ class CognitiveSystem:
                 return
 
         # Actionable diagnostics (instead of generic "No response")
-        mcp_ok = False
-        mcp_gemini = None
-        try:
-            req = Request("http://127.0.0.1:8000/health", headers={"accept": "application/json"})
-            with urlopen(req, timeout=2) as h:
-                data = json.loads(h.read().decode("utf-8") or "{}")
-                if isinstance(data, dict):
-                    mcp_ok = bool(data.get("status") == "ok")
-                    mcp_gemini = data.get("gemini")
-        except Exception:
-            pass
+        data = self._check_mcp_health() or {}
+        mcp_ok = data.get("status") == "ok"
+        mcp_gemini = data.get("gemini")
 
         has_key = bool(os.getenv("GEMINI_API_KEY"))
 
@@ -238,9 +888,21 @@ class CognitiveSystem:
 
         print("[GEMINI]: no response (provider reachable but returned empty output).")
 
+    def _check_mcp_health(self, ttl: float = MCP_HEALTH_TTL):
+        """MCP /health result, re-probed at most once per ttl seconds."""
+        cached = self._mcp_health_cache
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        data = mcp_health(timeout=2)
+        self._mcp_health_cache = (time.monotonic(), data)
+        return data
+
     def _parse_puter_chat_args(self, rest: str):
+        rest = rest or ""
         try:
-            tokens = shlex.split(rest or "")
+            # Without quotes or escapes shlex.split is plain whitespace
+            # splitting; only pay for its state machine when it matters.
+            tokens = shlex.split(rest) if _SHLEX_SPECIAL.intersection(rest) else rest.split()
         except ValueError as e:
             print(f"[PUTER]: parse error: {e}")
             return None, None
@@ -320,62 +982,60 @@ class CognitiveSystem:
         # Accept direct KEY=VALUE pastes.
         if "=" in raw and "http" not in raw:
             k, v = raw.split("=", 1)
-            if k.strip() in ("PUTER_AUTH_TOKEN", "puterAuthToken", "token", "authToken"):
-                t = "".join(v.strip().split())
+            if k.strip() == "PUTER_AUTH_TOKEN" or k.strip() in _PUTER_TOKEN_KEYS:
+                t = _strip_ws(v)
                 return t or None
             # Not a known key=value token format; fall through.
 
         # Direct token paste (no URL).
         if "http" not in raw and "puterAuthToken=" not in raw and "PUTER_AUTH_TOKEN=" not in raw and "token=" not in raw:
-            t = "".join(raw.split())
+            t = _strip_ws(raw)
             return t or None
 
         parsed = urllib.parse.urlparse(raw)
 
-        # Query params: ?puterAuthToken=... or ?token=...
-        q = urllib.parse.parse_qs(parsed.query or "")
-        for key in ("puterAuthToken", "token", "authToken"):
-            if key in q and q[key]:
-                t = urllib.parse.unquote(str(q[key][0]))
-                t = "".join(t.split())
-                return t or None
-
-        # Hash params: #...&puterAuthToken=... or #...&token=...
-        frag = urllib.parse.parse_qs((parsed.fragment or "").lstrip("#"))
-        for key in ("puterAuthToken", "token", "authToken"):
-            if key in frag and frag[key]:
-                t = urllib.parse.unquote(str(frag[key][0]))
-                t = "".join(t.split())
+        # Query params (?puterAuthToken=...), then hash params (#...&token=...).
+        for qs in (parsed.query, parsed.fragment.lstrip("#")):
+            t = _first_token_param(qs)
+            if t is not None:
                 return t or None
 
         return None
 
-    def _upsert_env_var(self, env_path: Path, key: str, value: str):
+    def _upsert_env_vars(self, env_path: Path, updates: dict[str, str], durable: bool = False):
+        """Set KEY=value lines in an env file with one read and one atomic write."""
         env_path.parent.mkdir(parents=True, exist_ok=True)
-        lines = []
+        text = ""
         if env_path.exists():
             try:
-                lines = env_path.read_text(encoding="utf-8").splitlines()
+                text = env_path.read_text(encoding="utf-8")
             except Exception:
-                lines = []
-
-        out = []
-        replaced = False
-        for line in lines:
-            s = line.strip()
-            if s.startswith(f"{key}="):
-                out.append(f"{key}={value}")
-                replaced = True
-            else:
-                out.append(line)
-
-        if not replaced:
-            out.append(f"{key}={value}")
-
-        env_path.write_text("\n".join(out).rstrip() + "\n", encoding="utf-8")
-
-    def _token_sha256(self, token: str) -> str:
-        return hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+                text = ""
+
+        # Replace every existing KEY= line in one pass (leading blanks allowed).
+        missing = []
+        for key, value in updates.items():
+            line = f"{key}={value}"
+            pat = re.compile(rf"^[ \t]*{re.escape(key)}=.*$", re.M)
+            text, n = pat.subn(lambda _m: line, text)
+            if not n:
+                missing.append(line)
+        text = "\n".join([text.rstrip(), *missing]).lstrip("\n") + "\n"
+
+        tmp = env_path.with_name(env_path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, env_path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
 
     def _get_puter_token_via_node_sdk(self) -> str | None:
         """Try Puter.js browser auth flow in Node and return token.
@@ -415,7 +1075,7 @@ class CognitiveSystem:
                             except Exception:
                                 payload = None
                             if isinstance(payload, dict) and payload.get("ok") and payload.get("token"):
-                                return "".join(str(payload.get("token") or "").split())
+                                return _strip_ws(payload.get("token"))
                             if isinstance(payload, dict) and payload.get("error"):
                                 d = payload.get("detail")
                                 msg = f"[PUTER LOGIN]: SDK auth error: {payload.get('error')}"
@@ -457,7 +1117,7 @@ class CognitiveSystem:
 
         out = (proc.stdout or "").strip()
         if proc.returncode == 0 and out:
-            return "".join(out.split())
+            return _strip_ws(out)
 
         err = (proc.stderr or "").strip()
         if err:
@@ -488,27 +1148,20 @@ class CognitiveSystem:
                 raw = raw[len(prefix):].strip()
                 break
 
+        env = os.environ
+
         # Reuse existing static credentials to avoid browser auth.
         if not raw:
-            existing_token = "".join(str(os.getenv("PUTER_AUTH_TOKEN") or os.getenv("puterAuthToken") or "").split())
-            if not existing_token and LLM_ENV_PATH.exists():
-                try:
-                    for line in LLM_ENV_PATH.read_text(encoding="utf-8").splitlines():
-                        s = line.strip()
-                        if not s or s.startswith("#") or "=" not in s:
-                            continue
-                        k, v = s.split("=", 1)
-                        if k.strip() in ("PUTER_AUTH_TOKEN", "puterAuthToken"):
-                            existing_token = "".join(v.strip().strip("'\"").split())
-                            if existing_token:
-                                os.environ["PUTER_AUTH_TOKEN"] = existing_token
-                                os.environ["puterAuthToken"] = existing_token
-                                break
-                except Exception:
-                    pass
+            existing_token = _strip_ws(env.get("PUTER_AUTH_TOKEN") or env.get("puterAuthToken"))
+            if not existing_token:
+                saved = _load_env_file(LLM_ENV_PATH)
+                existing_token = _strip_ws(saved.get("PUTER_AUTH_TOKEN") or saved.get("puterAuthToken"))
+                if existing_token:
+                    env["PUTER_AUTH_TOKEN"] = existing_token
+                    env["puterAuthToken"] = existing_token
             if existing_token:
                 token = existing_token
-            elif os.getenv("PUTER_API_KEY"):
+            elif env.get("PUTER_API_KEY"):
                 print("[PUTER LOGIN]: PUTER_API_KEY is already set; interactive login is not required.")
                 print("[PUTER LOGIN]: try: puter-chat \"hey\" --model claude-opus-4-6")
                 return
@@ -546,28 +1199,38 @@ class CognitiveSystem:
             print("[PUTER LOGIN]: could not parse token")
             return
 
-        token_hash = self._token_sha256(token)
-        existing_hash = (os.getenv("PUTER_TOKEN_SHA256") or "").strip()
+        token_hash = _token_sha256(token)
+        existing_hash = (env.get("PUTER_TOKEN_SHA256") or "").strip()
         if existing_hash and existing_hash == token_hash:
             print(f"[PUTER LOGIN]: token fingerprint unchanged ({token_hash[:12]}...), reusing session")
 
-        os.environ["PUTER_AUTH_TOKEN"] = token
-        os.environ["puterAuthToken"] = token
-        os.environ["PUTER_TOKEN_SHA256"] = token_hash
+        env["PUTER_AUTH_TOKEN"] = token
+        env["puterAuthToken"] = token
+        env["PUTER_TOKEN_SHA256"] = token_hash
 
-        try:
-            self._upsert_env_var(LLM_ENV_PATH, "PUTER_AUTH_TOKEN", token)
-            self._upsert_env_var(LLM_ENV_PATH, "PUTER_TOKEN_SHA256", token_hash)
-            # Keep default model pinned unless user changed it explicitly elsewhere.
-            if "PUTER_DEFAULT_MODEL" not in os.environ:
-                self._upsert_env_var(LLM_ENV_PATH, "PUTER_DEFAULT_MODEL", "claude-opus-4-6")
-            print(f"[PUTER LOGIN]: token saved -> {LLM_ENV_PATH}")
-            print(f"[PUTER LOGIN]: token sha256={token_hash}")
-        except Exception as e:
-            print(f"[PUTER LOGIN]: token set for current session, but failed to save env file: {e}")
+        # Only skip the write when llm/.env itself holds this token; the
+        # process env may have it from the shell or another env file.
+        saved = _load_env_file(LLM_ENV_PATH)
+        if (
+            _strip_ws(saved.get("PUTER_AUTH_TOKEN")) == token
+            and _strip_ws(saved.get("PUTER_TOKEN_SHA256")) == token_hash
+        ):
+            # The save that recorded this fingerprint also wrote the token (and model pin).
+            print(f"[PUTER LOGIN]: token already saved -> {LLM_ENV_PATH}")
+        else:
+            try:
+                updates = {"PUTER_AUTH_TOKEN": token, "PUTER_TOKEN_SHA256": token_hash}
+                # Keep default model pinned unless user changed it explicitly elsewhere.
+                if "PUTER_DEFAULT_MODEL" not in env:
+                    updates["PUTER_DEFAULT_MODEL"] = "claude-opus-4-6"
+                self._upsert_env_vars(LLM_ENV_PATH, updates)
+                print(f"[PUTER LOGIN]: token saved -> {LLM_ENV_PATH}")
+                print(f"[PUTER LOGIN]: token sha256={token_hash}")
+            except Exception as e:
+                print(f"[PUTER LOGIN]: token set for current session, but failed to save env file: {e}")
 
         # Immediate handshake after token capture.
-        model = os.getenv("PUTER_DEFAULT_MODEL", "claude-opus-4-6")
+        model = env.get("PUTER_DEFAULT_MODEL", "claude-opus-4-6")
         print(f"[PUTER LOGIN]: handshaking with model={model} ...")
         try:
             reply, used_model = call_puter_with_model("handshake check", model=model)
@@ -589,35 +1252,36 @@ class CognitiveSystem:
         print(f"[LEARN]: Stored → \"{text}\"")
 
     def command_define(self, term: str):
-        print("\n=== DEFINE RESULTS ===")
-        found = False
-        for i, m in enumerate(self.learning.episodic_learning_history, 1):
-            if term.lower() in (m.get("input", "").lower()):
-                print(f"Epi {i}: {m.get('input','')}")
-                found = True
-        if not found:
-            print("[DEFINE]: No matches.")
-        print("=====================")
+        lines = ["", "=== DEFINE RESULTS ==="]
+        lines.extend(f"Epi {i}: {m.get('input','')}" for i, m in self.learning.find_episodic(term))
+        if len(lines) == 2:
+            lines.append("[DEFINE]: No matches.")
+        lines.append("=====================")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def command_recall(self):
-        print("\n=== CORE MEMORIES ===")
-        for i, m in enumerate(self.learning.core_learning_history, 1):
-            print(f"{i}: {m.get('input','')}")
-        print("=====================")
-
-        print("\n=== EPISODIC MEMORIES ===")
-        for i, m in enumerate(self.learning.episodic_learning_history, 1):
-            print(f"{i}: {m.get('input','')}")
-        print("========================")
+        # One write for the whole listing rather than a print per memory.
+        lines = ["", "=== CORE MEMORIES ==="]
+        lines.extend(f"{i}: {m.get('input','')}" for i, m in enumerate(self.learning.core_learning_history, 1))
+        lines += ["=====================", "", "=== EPISODIC MEMORIES ==="]
+        lines.extend(f"{i}: {m.get('input','')}" for i, m in enumerate(self.learning.episodic_learning_history, 1))
+        lines.append("========================")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def _state_text(self) -> str:
+        ls = self.learning
+        return (
+            "\n=== STATE ===\n"
+            f"Core memories   : {len(ls.core_learning_history)}\n"
+            f"Episodic memory : {len(ls.episodic_learning_history)}\n"
+            f"Core pack file  : {ls.core_file}\n"
+            f"Epi pack file   : {ls.epi_file}\n"
+            "Status          : operational\n"
+            "================\n"
+        )
 
     def command_state(self):
-        print("\n=== STATE ===")
-        print("Core memories   :", len(self.learning.core_learning_history))
-        print("Episodic memory :", len(self.learning.episodic_learning_history))
-        print("Core pack file  :", self.learning.core_file)
-        print("Epi pack file   :", self.learning.epi_file)
-        print("Status          : operational")
-        print("================")
+        sys.stdout.write(self._state_text())
 
     def command_synthesize(self):
         if not self.synthesizer:
@@ -627,6 +1291,7 @@ class CognitiveSystem:
         print("[SYNTHESIS]:", s if s else "(no synthesis)")
 
     def command_pulse_now(self):
+        self._mcp_health_cache = None
         if not Pulse:
             print("[PULSE]: Pulse service unavailable.")
             return
@@ -634,6 +1299,7 @@ class CognitiveSystem:
         p.run_once()
 
     def command_pulse_start(self, seconds: str | None = None):
+        self._mcp_health_cache = None
         if not Pulse:
             print("[PULSE]: Pulse service unavailable.")
             return
@@ -651,6 +1317,7 @@ class CognitiveSystem:
         print(f"[PULSE]: started interval={interval}s")
 
     def command_pulse_stop(self):
+        self._mcp_health_cache = None
         if self._pulse:
             try:
                 self._pulse.stop()
@@ -662,12 +1329,14 @@ class CognitiveSystem:
             print("[PULSE]: not running")
 
     def command_health(self):
-        # Minimal local health summary.
-        self.command_state()
-        print("\n=== HEALTH ===")
-        print("Synthesizer     :", "ok" if self.synthesizer else "disabled")
-        print("Ollama adapter   :", "ok" if query_ollama else "disabled")
-        print("===============")
+        # Minimal local health summary, state included, in one write.
+        sys.stdout.write(
+            self._state_text()
+            + "\n=== HEALTH ===\n"
+            f"Synthesizer     : {'ok' if self.synthesizer else 'disabled'}\n"
+            f"Ollama adapter   : {'ok' if query_ollama else 'disabled'}\n"
+            "===============\n"
+        )
 
     def command_wander(self):
         # Safe curiosity == pulse-now for now.
@@ -708,48 +1377,59 @@ class CognitiveSystem:
         if kind not in ("epi", "core", "profiles"):
             kind = "epi"
 
+        # Lists pack_*.json plus pack*<suffix> (e.g. pack3_core.json).
         if kind == "epi":
             base = PERSONA_DIR
-            globs = ["pack_*.json", "pack*_episodic.json"]
+            suffix = "_episodic.json"
         elif kind == "core":
             base = META_DIR
-            globs = ["pack_*.json", "pack*_core.json"]
+            suffix = "_core.json"
         else:
             base = META_DIR / "Profiles"
-            globs = ["pack_*.json", "pack*_core.json"]
+            suffix = "_core.json"
 
-        if not base.exists():
+        # One directory read; names are filtered from the dirents.
+        try:
+            with os.scandir(base) as it:
+                packs = sorted(
+                    e.name
+                    for e in it
+                    if e.name.startswith("pack")
+                    and (e.name.endswith(suffix) or (e.name.startswith("pack_") and e.name.endswith(".json")))
+                    and e.is_file()
+                )
+        except FileNotFoundError:
             print(f"[PACK-LIST]: directory missing: {base}")
             return
-        found = set()
-        for g in globs:
-            for p in base.glob(g):
-                found.add(p.name)
-        packs = sorted(found)
-        print(f"[PACK-LIST:{kind}]: {len(packs)}")
-        for p in packs:
-            print(" -", p)
+        lines = [f"[PACK-LIST:{kind}]: {len(packs)}"]
+        lines.extend(f" - {p}" for p in packs)
+        sys.stdout.write("\n".join(lines) + "\n")
 
-    def command_load_pack(self, name: str):
-        if not name:
-            print("[LOAD-PACK]: missing name")
-            return
-        # Accept either absolute file path or short name.
+    @staticmethod
+    def _find_pack(base: Path, name: str, kind_tag: str) -> Path | None:
+        """Resolve an absolute path, a file name under base, or a short pack name.
+
+        Short names try pack<n><kind_tag>.json, pack_<n>.json, pack<n>.json in
+        that order and stop at the first hit; only the match is resolve()d.
+        """
         cand_in = Path(name)
-        candidates = []
         if cand_in.is_absolute():
-            candidates.append(cand_in)
-        elif cand_in.suffix:
-            candidates.append((PERSONA_DIR / cand_in).resolve())
+            return cand_in if cand_in.exists() else None
+        if cand_in.suffix:
+            candidates = [base / cand_in]
         else:
             n = name.strip()
-            candidates += [
-                (PERSONA_DIR / f"pack{n}_episodic.json").resolve(),
-                (PERSONA_DIR / f"pack_{n}.json").resolve(),
-                (PERSONA_DIR / f"pack{n}.json").resolve(),
-            ]
+            candidates = [base / f"pack{n}{kind_tag}.json", base / f"pack_{n}.json", base / f"pack{n}.json"]
+        for p in candidates:
+            if p.exists():
+                return p.resolve()
+        return None
 
-        chosen = next((p for p in candidates if p.exists()), None)
+    def command_load_pack(self, name: str):
+        if not name:
+            print("[LOAD-PACK]: missing name")
+            return
+        chosen = self._find_pack(PERSONA_DIR, name, "_episodic")
         if not chosen:
             print(f"[LOAD-PACK]: not found for '{name}' in {PERSONA_DIR}")
             return
@@ -760,21 +1440,7 @@ class CognitiveSystem:
         if not name:
             print("[LOAD-CORE]: missing name")
             return
-        cand_in = Path(name)
-        candidates = []
-        if cand_in.is_absolute():
-            candidates.append(cand_in)
-        elif cand_in.suffix:
-            candidates.append((META_DIR / cand_in).resolve())
-        else:
-            n = name.strip()
-            candidates += [
-                (META_DIR / f"pack{n}_core.json").resolve(),
-                (META_DIR / f"pack_{n}.json").resolve(),
-                (META_DIR / f"pack{n}.json").resolve(),
-            ]
-
-        chosen = next((p for p in candidates if p.exists()), None)
+        chosen = self._find_pack(META_DIR, name, "_core")
         if not chosen:
             print(f"[LOAD-CORE]: not found for '{name}' in {META_DIR}")
             return
@@ -789,7 +1455,10 @@ class CognitiveSystem:
             print("Usage: create-profile <name>")
             return
 
-        safe = "".join(ch if ch.isalnum() else "_" for ch in raw).strip("_")
+        if raw.isascii():
+            safe = raw.translate(_SAFE_NAME_TABLE).strip("_")
+        else:
+            safe = "".join(ch if ch.isalnum() else "_" for ch in raw).strip("_")
         if not safe:
             print("[CREATE-PROFILE]: invalid name")
             return
@@ -818,16 +1487,26 @@ class CognitiveSystem:
             "last_saved": ts,
         }
 
+        # Each payload is serialized once and shared by its main and alias file.
+        core_blob = (json.dumps(core_payload, indent=2) + "\n").encode("utf-8")
+        epi_blob = (json.dumps(epi_payload, indent=2) + "\n").encode("utf-8")
+
         created = []
-        for path, payload in (
-            (core_main, core_payload),
-            (epi_main, epi_payload),
-            (core_alias, core_payload),
-            (epi_alias, epi_payload),
+        for path, blob in (
+            (core_main, core_blob),
+            (epi_main, epi_blob),
+            (core_alias, core_blob),
+            (epi_alias, epi_blob),
         ):
-            if path.exists():
+            # O_EXCL: create-or-skip in one call, no exists() check to race against.
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
                 continue
-            path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+            try:
+                os.write(fd, blob)
+            finally:
+                os.close(fd)
             created.append(path.name)
 
         print(f"[CREATE-PROFILE]: name={safe}")
@@ -852,44 +1531,91 @@ class CognitiveSystem:
             print(f"[RUN-SCRIPT]: not found: {p}")
             return
         print(f"[RUN-SCRIPT]: {p}")
-        with p.open("r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line or line.startswith("#"):
-                    continue
-                print(f"> {line}")
-                self.handle_command(line)
+        # Read it all up front so the file is closed before any command runs.
+        stripped = map(str.strip, p.read_text(encoding="utf-8").splitlines())
+        for line in [ln for ln in stripped if ln and not ln.startswith("#")]:
+            print(f"> {line}")
+            self.handle_command(line)
 
     def command_scan(self):
         # Minimal local scan: try compiling core modules.
         import compileall
 
-        ok = compileall.compile_dir(str(PROJECT_ROOT / "core"), quiet=1)
-        ok = compileall.compile_dir(str(PROJECT_ROOT / "llm"), quiet=1) and ok
+        # workers=0: one compile process per CPU; bytecode that is up to date is skipped.
+        ok = compileall.compile_dir(str(PROJECT_ROOT / "core"), quiet=1, workers=0)
+        ok = compileall.compile_dir(str(PROJECT_ROOT / "llm"), quiet=1, workers=0) and ok
         print("[SCAN]:", "ok" if ok else "issues")
 
     # =========================
     # LOCAL SHELL HELPERS / LOCAL-ONLY COMMANDS
     # =========================
 
-    def _run_shell(self, cmd, label: str = "cmd"):
+    def _run_shell(self, cmd, label: str = "cmd", input_text: str | None = None, cwd=None, env=None, timeout=None):
         """Run a local shell command and print output.
 
         cmd can be a list[str] (no shell) or a string (shell=True).
+        input_text is fed on stdin; after timeout seconds the process is killed.
         """
         try:
-            if isinstance(cmd, (list, tuple)):
-                r = subprocess.run(cmd, text=True, capture_output=True)
-            else:
-                r = subprocess.run(cmd, shell=True, text=True, capture_output=True)
-            out = (r.stdout or "").strip()
-            err = (r.stderr or "").strip()
-            if out:
-                print(out)
+            p = subprocess.Popen(
+                cmd,
+                shell=not isinstance(cmd, (list, tuple)),
+                stdin=subprocess.PIPE if input_text is not None else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                cwd=cwd,
+                env=env,
+                close_fds=_SPAWN_CLOSE_FDS,
+            )
+            timed_out = threading.Event()
+            timer = None
+            if timeout is not None:
+                timer = threading.Timer(timeout, lambda: (timed_out.set(), p.kill()))
+                timer.daemon = True
+                timer.start()
+            if input_text is not None:
+                try:
+                    p.stdin.write(input_text)
+                    p.stdin.close()
+                except OSError:
+                    pass
+            # stderr drains on a thread (pipes aren't selectable on Windows)
+            # and is still reported as one block after the output.
+            err_chunks: list[str] = []
+            t = threading.Thread(target=lambda: err_chunks.append(p.stderr.read()), daemon=True)
+            t.start()
+
+            # Stream stdout as it arrives. Blank lines are held back until
+            # more output follows, so leading/trailing blanks stay trimmed.
+            seen = False
+            blanks = 0
+            for line in p.stdout:
+                line = line.rstrip("\r\n")
+                if not line.strip():
+                    blanks += seen
+                    continue
+                if blanks:
+                    print("\n" * (blanks - 1))
+                    blanks = 0
+                print(line)
+                seen = True
+            p.stdout.close()
+            rc = p.wait()
+            if timer is not None:
+                timer.cancel()
+            t.join()
+            p.stderr.close()
+            if timed_out.is_set():
+                print(f"[{label}]: timeout running {label.lower()}")
+                return
+
+            err = "".join(err_chunks).strip()
             if err:
                 print(f"[{label} stderr]:\n{err}")
-            if r.returncode != 0:
-                print(f"[{label}]: exit={r.returncode}")
+            if rc != 0:
+                print(f"[{label}]: exit={rc}")
         except FileNotFoundError:
             print(f"[{label}]: command not found")
         except Exception as e:
@@ -897,26 +1623,11 @@ class CognitiveSystem:
 
     def _find_qtmos_boot(self) -> Path | None:
         """Find QTMoS boot script (qtmos_boot.py) locally."""
-        env_path = os.getenv("QTM_BOOT_PATH")
-        if env_path:
-            p = Path(env_path)
-            if p.is_file():
-                return p.resolve()
-
-        # Walk up a few parents and look for QTMoS/qtmos_boot.py
-        cur = PROJECT_ROOT
-        for _ in range(8):
-            p = cur / "QTMoS" / "qtmos_boot.py"
-            try:
-                if p.is_file():
-                    return p.resolve()
-            except OSError:
-                pass
-            if cur.parent == cur:
-                break
-            cur = cur.parent
-
-        return None
+        found = _find_qtmos_boot_cached(os.getenv("QTM_BOOT_PATH"))
+        if found is None:
+            # Only hits are remembered; a miss is re-probed next time.
+            _find_qtmos_boot_cached.cache_clear()
+        return found
 
     def command_qtm_shell(self, rest: str):
         """qtm / qtm-shell [custom_command]
@@ -938,8 +1649,7 @@ class CognitiveSystem:
             return
 
         # QTMoS currently depends on numpy; check early so failures are clear.
-        chk = subprocess.run([sys.executable, "-c", "import numpy"], capture_output=True)
-        if chk.returncode != 0:
+        if not _numpy_available():
             print("[QTM ERROR]: Missing dependency: numpy")
             if os.getenv("VIRTUAL_ENV"):
                 print("  Fix (venv):  python -m pip install numpy")
@@ -948,24 +1658,7 @@ class CognitiveSystem:
             return
 
         # Bridge SoftAdmin env into QTMoS OS launch (read-only; no behavior changes unless the env file exists).
-        env = os.environ.copy()
-        env_file = os.getenv("QTM_OS_ENV_FILE") or str(Path.home() / ".config" / "qtmos" / "qtmos_os.env")
-        if env_file and os.path.exists(env_file):
-            try:
-                with open(env_file, "r", encoding="utf-8") as f:
-                    for raw in f:
-                        line = raw.strip()
-                        if not line or line.startswith("#"):
-                            continue
-                        if "=" not in line:
-                            continue
-                        k, v = line.split("=", 1)
-                        k = k.strip()
-                        v = v.strip().strip('"').strip("'")
-                        if k and k not in env:
-                            env[k] = v
-            except Exception:
-                pass
+        env = _child_env(os.getenv("QTM_OS_ENV_FILE") or str(Path.home() / ".config" / "qtmos" / "qtmos_os.env"))
 
         print(f"[QTM]: launching {script} using {sys.executable}")
         try:
@@ -975,15 +1668,15 @@ class CognitiveSystem:
 
     def command_live(self):
         """Launch bridge TUI for live operator mode."""
-        bridge = PROJECT_ROOT / "core" / "claw_live_bridge.py"
-        if not bridge.exists():
+        bridge = LIVE_BRIDGE_PATH
+        if not _script_present(bridge):
             print(f"[LIVE ERROR]: bridge not found: {bridge}")
             print("Run manually: python claw_live_bridge.py")
             return
 
         print("[LIVE]: launching claw_live_bridge.py")
         try:
-            subprocess.run([sys.executable, str(bridge)], cwd=str(PROJECT_ROOT / "core"))
+            subprocess.run([sys.executable, str(bridge)], cwd=str(bridge.parent))
         except Exception as e:
             print(f"[LIVE ERROR]: {e}")
 
@@ -992,23 +1685,24 @@ class CognitiveSystem:
 
         wslmenu               - show menu
         wslmenu gpu           - nvidia-smi
-        wslmenu envs          - list venv activate scripts under ~
+        wslmenu envs          - list venvs in ~, ~/.venvs, ~/venvs, ~/.virtualenvs
         wslmenu dirs          - print quick dirs
         wslmenu peek <path>   - ls <path>
         wslmenu servers       - ps aux filtered
         """
-        arg_str = (args or "").strip()
-        parts = arg_str.split() if arg_str else []
+        parts = (args or "").split(None, 1)
         sub = parts[0].lower() if parts else ""
 
         if not sub:
-            print("=== WSL/LINUX MENU ===")
-            print("wslmenu gpu        - GPU peek (nvidia-smi)")
-            print("wslmenu envs       - Show Python envs (~/*/bin/activate)")
-            print("wslmenu dirs       - Quick peek directories")
-            print("wslmenu peek <p>   - ls <p>")
-            print("wslmenu servers    - ps aux filtered for common servers")
-            print("======================")
+            sys.stdout.write(
+                "=== WSL/LINUX MENU ===\n"
+                "wslmenu gpu        - GPU peek (nvidia-smi)\n"
+                "wslmenu envs       - Show Python envs (~/*, ~/.venvs/*, ~/venvs/*, ~/.virtualenvs/*)\n"
+                "wslmenu dirs       - Quick peek directories\n"
+                "wslmenu peek <p>   - ls <p>\n"
+                "wslmenu servers    - ps aux filtered for common servers\n"
+                "======================\n"
+            )
             return
 
         if sub == "gpu":
@@ -1016,37 +1710,36 @@ class CognitiveSystem:
             return
 
         if sub == "envs":
-            cmd = 'find ~ -type f -name "activate" -path "*/bin/activate" | awk -F"/" \'{print $(NF-2)}\''
-            self._run_shell(cmd, label="envs")
+            # Conventional venv spots only; walking all of ~ is far too slow.
+            home = Path.home()
+            names = {p.parents[1].name for pat in _VENV_GLOBS for p in home.glob(pat)}
+            for name in sorted(names):
+                print(name)
             return
 
         if sub == "dirs":
-            print("=== QUICK DIRS ===")
-            dirs = [
-                str(Path("~").expanduser()),
-                str((Path("~") / "my-quantum-env").expanduser()),
-                str((Path("~") / "qiskit-aer").expanduser()),
-                str((Path("~") / "qubit-venv").expanduser()),
-                str((Path("~") / "quantum310").expanduser()),
-                "/mnt/c/Projects",
-                "/mnt/c/Projects/Daves Desktop Buddies/Head/Tenchin",
-                str(PROJECT_ROOT),
-            ]
-            for d in dirs:
-                print(f"- {d}")
+            sys.stdout.write("=== QUICK DIRS ===\n" + "".join(f"- {d}\n" for d in WSL_QUICK_DIRS))
             return
 
         if sub == "peek":
-            if len(parts) < 2:
+            path = parts[1].strip() if len(parts) > 1 else ""
+            if not path:
                 print("[wslmenu] Usage: wslmenu peek <path>")
                 return
-            path = " ".join(parts[1:])
             self._run_shell(["ls", path], label="peek")
             return
 
         if sub == "servers":
-            cmd = r'ps aux | egrep "ollama|python|jupyter|code|node|gunicorn" | grep -v egrep'
-            self._run_shell(cmd, label="servers")
+            try:
+                r = subprocess.run(["ps", "aux"], capture_output=True, text=True, close_fds=_SPAWN_CLOSE_FDS)
+            except FileNotFoundError:
+                print("[servers]: command not found")
+                return
+            for line in r.stdout.splitlines()[1:]:
+                if _SERVER_PROC_RE.search(line):
+                    print(line)
+            if r.returncode != 0:
+                print(f"[servers]: exit={r.returncode}")
             return
 
         print(f"[wslmenu] Unknown subcommand: {sub}")
@@ -1069,21 +1762,14 @@ class CognitiveSystem:
         cmd = (name or "").strip().lower()
         arg = (rest or "").strip()
 
-        if cmd in ("qtm-status",):
+        if cmd == "qtm-status":
             # Safe modern equivalent
             self.command_claw("status")
             return
 
-        if cmd in ("qtm-mode", "rails", "qhace", "forget", "duel", "ingest-url", "ingest-api", "crawl", "genesis-review"):
+        if cmd in _LEGACY_DELEGATED:
             print(f"[{cmd.upper()}]: delegating to V3...")
-            ok, out, err, rc = self._run_legacy_passthrough(f"{cmd} {arg}".strip(), timeout=90)
-            if out.strip():
-                print(out.rstrip())
-            if err.strip():
-                print(f"[{cmd.upper()} stderr]:")
-                print(err.rstrip())
-            if not ok:
-                print(f"[{cmd.upper()}]: V3 execution failed (exit={rc})")
+            self._print_legacy_result(cmd, self._run_legacy_passthrough(f"{cmd} {arg}".strip(), timeout=90))
             return
 
         if cmd == "puter-chat":
@@ -1096,55 +1782,83 @@ class CognitiveSystem:
 
         self.command_not_migrated(cmd)
 
+    def command_compat_legacy_batch(self, lines: list[str]):
+        """Run several delegated V3 commands (`a; b; c`) through one V3 session."""
+        names = [ln.split(None, 1)[0].lower() for ln in lines]
+        print(f"[V3 BATCH]: delegating {', '.join(names)} to V3...")
+        for name, result in zip(names, self._run_legacy_batch(lines, timeout=90)):
+            self._print_legacy_result(name, result)
+
+    @staticmethod
+    def _print_legacy_result(cmd: str, result: tuple):
+        ok, out, err, rc = result
+        if out.strip():
+            print(out.rstrip())
+        if err.strip():
+            print(f"[{cmd.upper()} stderr]:")
+            print(err.rstrip())
+        if not ok:
+            print(f"[{cmd.upper()}]: V3 execution failed (exit={rc})")
+
     # =========================
     # LEGACY BRIDGE
     # =========================
 
     def _run_legacy_passthrough(self, legacy_command: str, timeout: int = 60):
-        """Run a single command through CognitiveSystems_V3.py, then quit."""
-        if not LEGACY_V3_PATH.exists():
-            return False, "", f"Legacy V3 script not found: {LEGACY_V3_PATH}", 127
+        """Run a single command through CognitiveSystems_V3.py."""
+        return self._run_legacy_batch([legacy_command], timeout=timeout)[0]
+
+    def _run_legacy_batch(self, commands: list[str], timeout: int = 60) -> list[tuple]:
+        """Run commands through CognitiveSystems_V3.py; (ok, out, err, rc) each.
+
+        Uses the shared V3 worker unless QTM_LEGACY_WORKER=0. Then one fresh
+        V3 process runs the whole batch and quits; sentinel lines between the
+        commands split its output, and its stderr and exit code are reported
+        on the last command.
+        """
+        if not _script_present(LEGACY_V3_PATH):
+            return [(False, "", f"Legacy V3 script not found: {LEGACY_V3_PATH}", 127)] * len(commands)
 
         legacy_py = os.getenv("QTM_LEGACY_PY") or os.getenv("LEGACY_V3_PY") or sys.executable
 
-        env = os.environ.copy()
-        env_file = os.getenv("QTM_LEGACY_ENV_FILE")
-        if not env_file:
-            cand = (PROJECT_ROOT / "llm" / ".env")
-            if cand.exists():
-                env_file = str(cand)
+        env = _child_env(_legacy_env_file())
 
-        if env_file and os.path.exists(env_file):
+        if LEGACY_WORKER:
             try:
-                with open(env_file, "r", encoding="utf-8") as f:
-                    for raw in f:
-                        line = raw.strip()
-                        if not line or line.startswith("#") or "=" not in line:
-                            continue
-                        k, v = line.split("=", 1)
-                        k = k.strip()
-                        v = v.strip().strip('"').strip("'")
-                        if k and k not in env:
-                            env[k] = v
-            except Exception:
-                pass
+                return _LEGACY_WORKER.run_many(
+                    [legacy_py, str(LEGACY_V3_PATH)], os.environ if env is None else env, commands, timeout
+                )
+            except Exception as e:
+                return [(False, "", str(e), 1)] * len(commands)
 
-        input_text = f"{legacy_command}\nquit\n"
+        marks = [f"__qtm_mark_{i}__" for i in range(len(commands) - 1)]
+        input_text = "".join(f"{c}\n{m}\n" for c, m in zip(commands, marks)) + f"{commands[-1]}\nquit\n"
         try:
             r = subprocess.run(
                 [legacy_py, str(LEGACY_V3_PATH)],
                 input=input_text,
                 text=True,
                 capture_output=True,
-                timeout=timeout,
+                timeout=timeout * len(commands),
                 cwd=str(LEGACY_V3_PATH.parent),
                 env=env,
+                close_fds=_SPAWN_CLOSE_FDS,
             )
-            return r.returncode == 0, (r.stdout or ""), (r.stderr or ""), r.returncode
         except subprocess.TimeoutExpired:
-            return False, "", "timeout running legacy command", 124
+            return [(False, "", "timeout running legacy command", 124)] * len(commands)
         except Exception as e:
-            return False, "", str(e), 1
+            return [(False, "", str(e), 1)] * len(commands)
+
+        ok = r.returncode == 0
+        outs = [[]]
+        for line in (r.stdout or "").splitlines(keepends=True):
+            if len(outs) <= len(marks) and marks[len(outs) - 1] in line:
+                outs.append([])
+            else:
+                outs[-1].append(line)
+        outs += [[]] * (len(commands) - len(outs))
+        results = [(ok, "".join(o), "", r.returncode) for o in outs[:-1]]
+        return results + [(ok, "".join(outs[-1]), (r.stderr or ""), r.returncode)]
 
     def command_legacy(self, rest: str = ""):
         """legacy: read-only bridge to CognitiveSystems_V3.py via subprocess.
@@ -1162,26 +1876,28 @@ class CognitiveSystem:
 
         sub = parts[0].lower() if parts else "help"
 
-        if sub in ("help", "-h", "--help"):
+        if sub in _HELP_ARGS:
             if as_json:
-                print(json.dumps({"kind": "legacy.help", "usage": ["legacy status [--json]"]}, indent=2))
+                print(_dumps_pretty({"kind": "legacy.help", "usage": ["legacy status [--json]"]}))
                 return
-            print("=== LEGACY ===")
-            print("legacy status [--json]  - run CognitiveSystems_V3.py and return its status output")
-            print("=============")
+            sys.stdout.write(
+                "=== LEGACY ===\n"
+                "legacy status [--json]  - run CognitiveSystems_V3.py and return its status output\n"
+                "=============\n"
+            )
             return
 
         if sub != "status":
             if as_json:
-                print(json.dumps({"kind": "legacy.error", "error": {"message": f"unknown subcommand: {sub}"}}, indent=2))
+                print(_dumps_pretty({"kind": "legacy.error", "error": {"message": f"unknown subcommand: {sub}"}}))
                 return
             print(f"[LEGACY]: unknown subcommand: {sub} (try: legacy help)")
             return
 
-        if not LEGACY_V3_PATH.exists():
+        if not _script_present(LEGACY_V3_PATH):
             msg = f"Legacy V3 script not found: {LEGACY_V3_PATH}"
             if as_json:
-                print(json.dumps({"kind": "legacy.status", "ok": False, "error": {"message": msg}}, indent=2))
+                print(_dumps_pretty({"kind": "legacy.status", "ok": False, "error": {"message": msg}}))
                 return
             print("[LEGACY]:", msg)
             return
@@ -1191,58 +1907,27 @@ class CognitiveSystem:
         # Prefer an explicit legacy venv python if provided.
         legacy_py = os.getenv("QTM_LEGACY_PY") or os.getenv("LEGACY_V3_PY")
 
-        def _py_supports_google_genai(py_path: str) -> bool:
-            try:
-                r0 = subprocess.run(
-                    [py_path, "-c", "from google import genai"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                return r0.returncode == 0
-            except Exception:
-                return False
-
         if not legacy_py:
             # Best-effort auto-pick: prefer known venvs that can import google-genai.
-            candidates = [
-                str(Path.home() / "qtmos-venv" / "bin" / "python"),
-                str(Path.home() / ".venvs" / "qtmos-v3" / "bin" / "python"),
-            ]
-            for c in candidates:
-                if os.path.exists(c) and _py_supports_google_genai(c):
-                    legacy_py = c
-                    break
+            legacy_py = _autodetect_legacy_py(str(Path.home()))
+            if legacy_py is None:
+                # Only hits are remembered; a miss is re-probed next time.
+                _autodetect_legacy_py.cache_clear()
 
         cmd = [legacy_py or sys.executable, str(LEGACY_V3_PATH)]
         input_text = "state\nquit\n"
 
         # Environment bridging: load keys the same way QTMoS core does (dotenv), but without importing.
         # Default env file: <project_root>/llm/.env (if present). Override via QTM_LEGACY_ENV_FILE.
-        env = os.environ.copy()
-        env_file = os.getenv("QTM_LEGACY_ENV_FILE")
-        if not env_file:
-            cand = (PROJECT_ROOT / "llm" / ".env")
-            if cand.exists():
-                env_file = str(cand)
-
-        if env_file and os.path.exists(env_file):
-            try:
-                with open(env_file, "r", encoding="utf-8") as f:
-                    for raw in f:
-                        line = raw.strip()
-                        if not line or line.startswith("#"):
-                            continue
-                        if "=" not in line:
-                            continue
-                        k, v = line.split("=", 1)
-                        k = k.strip()
-                        v = v.strip().strip('"').strip("'")
-                        # Only set if not already present in the current environment
-                        if k and k not in env:
-                            env[k] = v
-            except Exception:
-                pass
+        # Only keys not already present in the current environment are added.
+        env = _child_env(_legacy_env_file())
+
+        if not as_json:
+            # Human output streams as V3 prints it; stderr follows if present.
+            self._run_shell(
+                cmd, label="LEGACY", input_text=input_text, cwd=str(LEGACY_V3_PATH.parent), env=env, timeout=20
+            )
+            return
 
         try:
             r = subprocess.run(
@@ -1253,54 +1938,62 @@ class CognitiveSystem:
                 timeout=20,
                 cwd=str(LEGACY_V3_PATH.parent),
                 env=env,
+                close_fds=_SPAWN_CLOSE_FDS,
             )
         except subprocess.TimeoutExpired:
-            if as_json:
-                print(json.dumps({"kind": "legacy.status", "ok": False, "error": {"message": "timeout running legacy"}}, indent=2))
-                return
-            print("[LEGACY]: timeout running legacy")
+            print(_dumps_pretty({"kind": "legacy.status", "ok": False, "error": {"message": "timeout running legacy"}}))
             return
         except Exception as e:
-            if as_json:
-                print(json.dumps({"kind": "legacy.status", "ok": False, "error": {"message": str(e)}}, indent=2))
-                return
-            print(f"[LEGACY]: failed to run: {e}")
+            print(_dumps_pretty({"kind": "legacy.status", "ok": False, "error": {"message": str(e)}}))
             return
 
         out = (r.stdout or "")
         err = (r.stderr or "")
         ok = r.returncode == 0
 
-        if as_json:
-            print(
-                json.dumps(
-                    {
-                        "kind": "legacy.status",
-                        "ok": ok,
-                        "returncode": r.returncode,
-                        "cmd": cmd,
-                        "stdout": out,
-                        "stderr": err,
-                    },
-                    indent=2,
-                    ensure_ascii=False,
-                )
+        print(
+            _dumps_pretty(
+                {
+                    "kind": "legacy.status",
+                    "ok": ok,
+                    "returncode": r.returncode,
+                    "cmd": cmd,
+                    "stdout": out,
+                    "stderr": err,
+                }
             )
-            return
-
-        # Human output: show stdout primarily; stderr if present.
-        if out.strip():
-            print(out.rstrip())
-        if err.strip():
-            print("[LEGACY stderr]:")
-            print(err.rstrip())
-        if not ok:
-            print(f"[LEGACY]: exit={r.returncode}")
+        )
 
     # =========================
     # INTROSPECTION / OPERATOR (claw)
     # =========================
 
+    def status_snapshot(self) -> dict:
+        """The `claw status --json` payload, built straight from live state."""
+        return {
+            "kind": "claw.status",
+            "project_root": str(PROJECT_ROOT),
+            "meta_dir": str(META_DIR),
+            "persona_dir": str(PERSONA_DIR),
+            "preferred_llm": getattr(self, "preferred_llm", "(unset)"),
+            "adapters": {
+                "synthesizer": bool(self.synthesizer),
+                "ollama": bool(query_ollama),
+                "gemini": bool(self.gemini),
+            },
+            "memory": {
+                "core_file": str(self.learning.core_file),
+                "epi_file": str(self.learning.epi_file),
+                "core_count": len(self.learning.core_learning_history),
+                "epi_count": len(self.learning.episodic_learning_history),
+            },
+        }
+
+    def epi_tail(self, n: int) -> list[str]:
+        """Inputs of the last n episodic memories (oldest first)."""
+        hist = self.learning.episodic_learning_history
+        return [hist[i].get("input", "") for i in range(len(hist) - max(0, min(n, len(hist))), len(hist))]
+
     def command_claw(self, rest: str = ""):
         """claw: safe, local-only introspection.
 
@@ -1324,9 +2017,9 @@ class CognitiveSystem:
 
         def _dump_json(obj):
             # Machine-readable, single payload.
-            print(json.dumps(obj, indent=2, ensure_ascii=False, default=str))
+            print(_dumps_pretty(obj))
 
-        if sub in ("help", "-h", "--help"):
+        if sub in _HELP_ARGS:
             if as_json:
                 _dump_json(
                     {
@@ -1339,46 +2032,33 @@ class CognitiveSystem:
                     }
                 )
                 return
-            print("=== CLAW ===")
-            print("claw status [--json]                - summary of subsystem state (read-only)")
-            print("claw map [--json]                   - show important paths + components")
-            print("claw memory [core|epi] [n] [--json] - summarize memory packs (optionally show last n)")
-            print("==========")
+            sys.stdout.write(
+                "=== CLAW ===\n"
+                "claw status [--json]                - summary of subsystem state (read-only)\n"
+                "claw map [--json]                   - show important paths + components\n"
+                "claw memory [core|epi] [n] [--json] - summarize memory packs (optionally show last n)\n"
+                "==========\n"
+            )
             return
 
         if sub == "status":
-            payload = {
-                "kind": "claw.status",
-                "project_root": str(PROJECT_ROOT),
-                "meta_dir": str(META_DIR),
-                "persona_dir": str(PERSONA_DIR),
-                "preferred_llm": getattr(self, "preferred_llm", "(unset)"),
-                "adapters": {
-                    "synthesizer": bool(self.synthesizer),
-                    "ollama": bool(query_ollama),
-                    "gemini": bool(self.gemini),
-                },
-                "memory": {
-                    "core_file": str(self.learning.core_file),
-                    "epi_file": str(self.learning.epi_file),
-                    "core_count": len(self.learning.core_learning_history),
-                    "epi_count": len(self.learning.episodic_learning_history),
-                },
-            }
+            payload = self.status_snapshot()
             if as_json:
                 _dump_json(payload)
                 return
-            print("\n=== CLAW STATUS ===")
-            print("Project root    :", PROJECT_ROOT)
-            print("Meta dir        :", META_DIR)
-            print("Persona dir     :", PERSONA_DIR)
-            print("Preferred LLM   :", getattr(self, "preferred_llm", "(unset)"))
-            print("Synthesizer     :", "ok" if self.synthesizer else "disabled")
-            print("Ollama adapter  :", "ok" if query_ollama else "disabled")
-            print("Gemini adapter  :", "ok" if self.gemini else "disabled")
-            print("Core memories   :", len(self.learning.core_learning_history))
-            print("Episodic memory :", len(self.learning.episodic_learning_history))
-            print("===============" )
+            sys.stdout.write(
+                "\n=== CLAW STATUS ===\n"
+                f"Project root    : {PROJECT_ROOT}\n"
+                f"Meta dir        : {META_DIR}\n"
+                f"Persona dir     : {PERSONA_DIR}\n"
+                f"Preferred LLM   : {getattr(self, 'preferred_llm', '(unset)')}\n"
+                f"Synthesizer     : {'ok' if self.synthesizer else 'disabled'}\n"
+                f"Ollama adapter  : {'ok' if query_ollama else 'disabled'}\n"
+                f"Gemini adapter  : {'ok' if self.gemini else 'disabled'}\n"
+                f"Core memories   : {len(self.learning.core_learning_history)}\n"
+                f"Episodic memory : {len(self.learning.episodic_learning_history)}\n"
+                "===============\n"
+            )
             return
 
         if sub == "map":
@@ -1387,8 +2067,8 @@ class CognitiveSystem:
                 "paths": {
                     "project_root": str(PROJECT_ROOT),
                     "meta_dir": str(META_DIR),
-                    "core_path": str(CORE_PATH),
-                    "default_epi_path": str(DEFAULT_EPI_PATH),
+                    "core_path": CORE_PATH_STR,
+                    "default_epi_path": DEFAULT_EPI_PATH_STR,
                     "active_core": str(self.learning.core_file),
                     "active_epi": str(self.learning.epi_file),
                 },
@@ -1402,19 +2082,21 @@ class CognitiveSystem:
             if as_json:
                 _dump_json(payload)
                 return
-            print("\n=== CLAW MAP ===")
-            print("PROJECT_ROOT:", PROJECT_ROOT)
-            print("META_DIR     :", META_DIR)
-            print("CORE_PATH    :", CORE_PATH)
-            print("DEFAULT_EPI  :", DEFAULT_EPI_PATH)
-            print("Active core  :", self.learning.core_file)
-            print("Active epi   :", self.learning.epi_file)
-            print("Components   :")
-            print(" - LearningSystem")
-            print(" - Synthesizer:", "enabled" if self.synthesizer else "disabled")
-            print(" - Pulse     :", "available" if Pulse else "unavailable")
-            print(" - MCP(OpenAI/Gemini):", "available" if (call_mcp_chat or call_mcp_gemini) else "unavailable")
-            print("=============")
+            sys.stdout.write(
+                "\n=== CLAW MAP ===\n"
+                f"PROJECT_ROOT: {PROJECT_ROOT}\n"
+                f"META_DIR     : {META_DIR}\n"
+                f"CORE_PATH    : {CORE_PATH}\n"
+                f"DEFAULT_EPI  : {DEFAULT_EPI_PATH}\n"
+                f"Active core  : {self.learning.core_file}\n"
+                f"Active epi   : {self.learning.epi_file}\n"
+                "Components   :\n"
+                " - LearningSystem\n"
+                f" - Synthesizer: {'enabled' if self.synthesizer else 'disabled'}\n"
+                f" - Pulse     : {'available' if Pulse else 'unavailable'}\n"
+                f" - MCP(OpenAI/Gemini): {'available' if (call_mcp_chat or call_mcp_gemini) else 'unavailable'}\n"
+                "=============\n"
+            )
             return
 
         if sub == "memory":
@@ -1427,9 +2109,9 @@ class CognitiveSystem:
                 except ValueError:
                     n = None
 
-            def _tail(hist: list[dict], k: int):
-                k = max(0, min(k, len(hist)))
-                return hist[-k:] if k else []
+            def _tail_start(hist: list[dict], k: int) -> int:
+                # Index of the first of the last k records; iterate by index, no slice copy.
+                return len(hist) - max(0, min(k, len(hist)))
 
             payload = {
                 "kind": "claw.memory",
@@ -1444,7 +2126,7 @@ class CognitiveSystem:
                 payload["tail"] = {
                     "which": which,
                     "n": min(n, len(hist)),
-                    "items": [m.get("input", "") for m in _tail(hist, n)],
+                    "items": [hist[i].get("input", "") for i in range(_tail_start(hist, n), len(hist))],
                 }
             elif which not in ("summary", "core", "epi"):
                 payload["error"] = {"message": f"unknown memory target: {which}", "expected": ["summary", "core", "epi"]}
@@ -1462,8 +2144,8 @@ class CognitiveSystem:
             if which in ("core", "epi") and n:
                 hist = self.learning.core_learning_history if which == "core" else self.learning.episodic_learning_history
                 print(f"\nLast {min(n, len(hist))} from {which}:")
-                for i, m in enumerate(_tail(hist, n), 1):
-                    print(f"- {m.get('input','')}")
+                for i in range(_tail_start(hist, n), len(hist)):
+                    print(f"- {hist[i].get('input','')}")
             elif which not in ("summary", "core", "epi"):
                 print(f"[CLAW]: unknown memory target: {which} (use: core|epi)")
 
@@ -1484,119 +2166,24 @@ class CognitiveSystem:
             if not line:
                 return
 
-            parts = line.split()
-            cmd = parts[0].lower()
-            rest = line[len(parts[0]) :].strip()
-
-            if cmd in ("chat", "ask"):
-                self.command_chat(rest)
-
-            elif cmd == "ollama":
-                self.command_ollama(rest)
-
-            elif cmd == "gemini":
-                self.command_gemini(rest)
-
-            elif cmd in ("puter-login", "puter-auth"):
-                self.command_puter_login(rest)
-
-            elif cmd == "learn":
-                self.command_learn(rest)
-
-            elif cmd == "define":
-                self.command_define(rest)
-
-            elif cmd == "recall":
-                self.command_recall()
-
-            elif cmd == "state":
-                self.command_state()
-
-            elif cmd == "health":
-                self.command_health()
-
-            elif cmd == "synthesize":
-                self.command_synthesize()
-
-            elif cmd == "pulse-now":
-                self.command_pulse_now()
-
-            elif cmd == "pulse-start":
-                self.command_pulse_start(rest or None)
-
-            elif cmd == "pulse-stop":
-                self.command_pulse_stop()
-
-            elif cmd == "wander":
-                self.command_wander()
+            # `qhace; rails; forget x` -> one V3 round trip for the whole run.
+            if ";" in line:
+                batch = [seg.strip() for seg in line.split(";") if seg.strip()]
+                if len(batch) > 1 and all(seg.split(None, 1)[0].lower() in _LEGACY_DELEGATED for seg in batch):
+                    self.command_compat_legacy_batch(batch)
+                    return
 
-            elif cmd == "ingest-ollama":
-                self.command_ingest_ollama(rest)
-
-            elif cmd == "promote":
-                self.command_promote(rest)
-
-            elif cmd == "whoami":
-                self.command_whoami()
-
-            elif cmd == "pack-list":
-                self.command_pack_list(rest or None)
-
-            elif cmd == "core-list":
-                self.command_pack_list("core")
-
-            elif cmd == "load-pack":
-                self.command_load_pack(rest)
-
-            elif cmd == "load-core":
-                self.command_load_core(rest)
-
-            elif cmd in ("create-profile", "new-profile"):
-                self.command_create_profile(rest)
-
-            elif cmd == "run-script":
-                self.command_run_script(rest)
-
-            elif cmd == "scan":
-                self.command_scan()
-
-            elif cmd in ("qtm", "qtm-shell"):
-                self.command_qtm_shell(rest)
-
-            elif cmd == "live":
-                self.command_live()
-
-            elif cmd == "wslmenu":
-                self.command_wslmenu(rest)
-
-            elif cmd == "claw":
-                self.command_claw(rest)
-
-            elif cmd == "legacy":
-                self.command_legacy(rest)
-
-            # V3 compatibility shims
-            elif cmd in (
-                "qtm-status",
-                "qtm-mode",
-                "rails",
-                "qhace",
-                "forget",
-                "duel",
-                "ingest-url",
-                "ingest-api",
-                "crawl",
-                "genesis-review",
-                "puter-chat",
-                "puter-models",
-            ):
-                self.command_compat_legacy(cmd, rest)
-
-            elif cmd in ("exit", "quit"):
-                raise SystemExit
+            parts = line.split(None, 1)
+            if not parts:
+                return
+            cmd = parts[0].lower()
+            rest = parts[1].strip() if len(parts) > 1 else ""
 
-            else:
+            handler = self._COMMANDS.get(cmd)
+            if handler is None:
                 print(f"[UNKNOWN COMMAND]: '{line}'")
+                return
+            handler(self, cmd, rest)
 
         except SystemExit:
             print("[MAIN]: Shutdown requested.")
@@ -1605,6 +2192,53 @@ class CognitiveSystem:
             print("[MAIN ERROR]: Unhandled exception.")
             logging.error("handle_command error", exc_info=True)
 
+    def _command_exit(self, cmd: str, rest: str):
+        raise SystemExit
+
+    # Command name -> handler(self, cmd, rest), built once for the class.
+    _COMMANDS = {
+        "chat": lambda self, cmd, rest: self.command_chat(rest),
+        "ollama": lambda self, cmd, rest: self.command_ollama(rest),
+        "gemini": lambda self, cmd, rest: self.command_gemini(rest),
+        "puter-login": lambda self, cmd, rest: self.command_puter_login(rest),
+        "learn": lambda self, cmd, rest: self.command_learn(rest),
+        "define": lambda self, cmd, rest: self.command_define(rest),
+        "recall": lambda self, cmd, rest: self.command_recall(),
+        "state": lambda self, cmd, rest: self.command_state(),
+        "health": lambda self, cmd, rest: self.command_health(),
+        "synthesize": lambda self, cmd, rest: self.command_synthesize(),
+        "pulse-now": lambda self, cmd, rest: self.command_pulse_now(),
+        "pulse-start": lambda self, cmd, rest: self.command_pulse_start(rest or None),
+        "pulse-stop": lambda self, cmd, rest: self.command_pulse_stop(),
+        "wander": lambda self, cmd, rest: self.command_wander(),
+        "ingest-ollama": lambda self, cmd, rest: self.command_ingest_ollama(rest),
+        "promote": lambda self, cmd, rest: self.command_promote(rest),
+        "whoami": lambda self, cmd, rest: self.command_whoami(),
+        "pack-list": lambda self, cmd, rest: self.command_pack_list(rest or None),
+        "core-list": lambda self, cmd, rest: self.command_pack_list("core"),
+        "load-pack": lambda self, cmd, rest: self.command_load_pack(rest),
+        "load-core": lambda self, cmd, rest: self.command_load_core(rest),
+        "create-profile": lambda self, cmd, rest: self.command_create_profile(rest),
+        "run-script": lambda self, cmd, rest: self.command_run_script(rest),
+        "scan": lambda self, cmd, rest: self.command_scan(),
+        "qtm": lambda self, cmd, rest: self.command_qtm_shell(rest),
+        "live": lambda self, cmd, rest: self.command_live(),
+        "wslmenu": lambda self, cmd, rest: self.command_wslmenu(rest),
+        "claw": lambda self, cmd, rest: self.command_claw(rest),
+        "legacy": lambda self, cmd, rest: self.command_legacy(rest),
+        "exit": _command_exit,
+    }
+    # Aliases
+    _COMMANDS["ask"] = _COMMANDS["chat"]
+    _COMMANDS["puter-auth"] = _COMMANDS["puter-login"]
+    _COMMANDS["new-profile"] = _COMMANDS["create-profile"]
+    _COMMANDS["qtm-shell"] = _COMMANDS["qtm"]
+    _COMMANDS["quit"] = _COMMANDS["exit"]
+    # V3 compatibility shims
+    _COMMANDS.update(
+        dict.fromkeys(_LEGACY_DELEGATED | {"qtm-status", "puter-chat", "puter-models"}, command_compat_legacy)
+    )
+
 
 def run_cli():
     system = CognitiveSystem()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import re
 from pathlib import Path
 
 # Canonical paths: keep aligned with modular core configuration.
@@ -18,6 +19,11 @@ class CommandBridge:
     Intentionally lightweight: no hardcoded host paths, no stale flat-module imports.
     """
 
+    # Lines that must never reach the system, matched in one pass.
+    _DENY = re.compile(r"force-learn|admin-inject")
+    # Commands that are rejected when given without an argument.
+    _NEEDS_ARG = frozenset(("ingest-api",))
+
     def __init__(self, system, log_dir=None):
         self.system = system
         if log_dir is None:
@@ -29,9 +35,11 @@ class CommandBridge:
         line = (line or "").strip()
         if not line or line.startswith("#"):
             return False
-        if "force-learn" in line or "admin-inject" in line:
+        if self._DENY.search(line):
             return False
-        if line.startswith("ingest-api") and len(line.split()) < 2:
+        # Only need the command word and whether an argument follows.
+        parts = line.split(None, 1)
+        if len(parts) < 2 and parts[0].lower() in self._NEEDS_ARG:
             return False
         return True
 
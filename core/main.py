@@ -13,10 +13,18 @@ except ModuleNotFoundError:
     pass
 
 from pathlib import Path
+import contextlib
+import errno
+import importlib.util
+import io
 import sys
 import os
+import selectors
 import subprocess
 import socket
+import threading
+import time
+import traceback
 
 
 def _init_line_editing(history_name: str = ".qtmos_history"):
@@ -127,11 +135,9 @@ def _ensure_numpy_for_qtmos(*, quiet: bool = False):
 
     quiet=True suppresses informational prints (used for one-shot mode).
     """
-    try:
-        import numpy  # noqa: F401
+    # A spec lookup is enough to know numpy is installed; importing it is slow.
+    if importlib.util.find_spec("numpy") is not None:
         return
-    except ModuleNotFoundError:
-        pass
 
     in_venv = bool(os.getenv("VIRTUAL_ENV"))
     auto = os.getenv("QTM_AUTO_INSTALL_DEPS", "1") == "1"
@@ -151,12 +157,42 @@ def _ensure_numpy_for_qtmos(*, quiet: bool = False):
             print("[DEPS ERROR]: failed to auto-install numpy:", e)
 
 
-def _port_open(host: str, port: int, timeout_s: float = 0.25) -> bool:
+def _ports_open(addrs, timeout_s: float = 0.1) -> set:
+    """Which (ipv4, port) pairs accept a TCP connection, all probed at once.
+
+    Connects are non-blocking and share one timeout, so the cold-start cost is
+    one timeout at most rather than one per port.
+    """
+    found = set()
+    sel = selectors.DefaultSelector()
     try:
-        with socket.create_connection((host, port), timeout=timeout_s):
-            return True
-    except OSError:
-        return False
+        for addr in addrs:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            rc = sock.connect_ex(addr)
+            if rc in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                sel.register(sock, selectors.EVENT_WRITE, addr)
+                continue
+            if rc == 0:
+                found.add(addr)
+            sock.close()
+
+        deadline = time.monotonic() + timeout_s
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _events in sel.select(remaining):
+                sock = key.fileobj
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    found.add(key.data)
+                sel.unregister(sock)
+                sock.close()
+    finally:
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+    return found
 
 
 def _start_background(
@@ -207,40 +243,35 @@ def _bg_python_executable() -> str:
     return sys.executable
 
 
-def _ensure_background_services(*, quiet: bool = False):
-    """Best-effort: start local helper services if they aren't already running.
+MCP_ROOT_CACHE = PROJECT_ROOT / "runtime" / "mcp_root.cache"
 
-    Controlled by env:
-      QTM_AUTO_START_SERVERS=1 (default) / 0
 
-    quiet=True suppresses informational prints (used for one-shot mode).
-    """
+def _find_mcp_root() -> str | None:
+    """Directory containing mcp_server.py (used as the MCP server's cwd).
 
-    if os.getenv("QTM_AUTO_START_SERVERS", "1") != "1":
-        return
+    MCP_ROOT overrides. Otherwise the last discovered root is read back from
+    MCP_ROOT_CACHE and reused while it still holds mcp_server.py; only then is
+    the (mount-crossing, stat-heavy) discovery below run again.
+    """
+    mcp_root = os.getenv("MCP_ROOT")
+    if mcp_root:
+        return mcp_root
 
-    # ---- Ollama ----
-    if not _port_open("127.0.0.1", 11434):
-        _start_background(
-            ["ollama", "serve"],
-            cwd=None,
-            log_path=PROJECT_ROOT / "runtime" / "logs" / "ollama-serve.log",
-            label="OLLAMA",
-            quiet=quiet,
-        )
+    try:
+        cached = MCP_ROOT_CACHE.read_text(encoding="utf-8").strip()
+    except OSError:
+        cached = ""
+    if cached and (Path(cached) / "mcp_server.py").exists():
+        return cached
 
-    # ---- MCP server (FastAPI/uvicorn) ----
-    # Allow override via MCP_ROOT; otherwise auto-discover a directory containing mcp_server.py
-    mcp_root = os.getenv("MCP_ROOT")
-    if not mcp_root:
-        # 1) Walk upward from this file and pick first directory containing mcp_server.py
-        try:
-            for p in Path(__file__).resolve().parents:
-                if (p / "mcp_server.py").exists():
-                    mcp_root = str(p)
-                    break
-        except Exception:
-            pass
+    # 1) Walk upward from this file and pick first directory containing mcp_server.py
+    try:
+        for p in Path(__file__).resolve().parents:
+            if (p / "mcp_server.py").exists():
+                mcp_root = str(p)
+                break
+    except Exception:
+        pass
 
     if not mcp_root:
         candidates = []
@@ -268,7 +299,45 @@ def _ensure_background_services(*, quiet: bool = False):
             except Exception:
                 continue
 
-    if not _port_open("127.0.0.1", 8000):
+    try:
+        if mcp_root:
+            MCP_ROOT_CACHE.write_text(mcp_root, encoding="utf-8")
+        elif cached:
+            MCP_ROOT_CACHE.unlink()
+    except OSError:
+        pass
+    return mcp_root
+
+
+def _ensure_background_services(*, quiet: bool = False):
+    """Best-effort: start local helper services if they aren't already running.
+
+    Controlled by env:
+      QTM_AUTO_START_SERVERS=1 (default) / 0
+
+    quiet=True suppresses informational prints (used for one-shot mode).
+    """
+
+    if os.getenv("QTM_AUTO_START_SERVERS", "1") != "1":
+        return
+
+    ollama_addr = ("127.0.0.1", 11434)
+    mcp_addr = ("127.0.0.1", 8000)
+    listening = _ports_open((ollama_addr, mcp_addr))
+
+    # ---- Ollama ----
+    if ollama_addr not in listening:
+        _start_background(
+            ["ollama", "serve"],
+            cwd=None,
+            log_path=PROJECT_ROOT / "runtime" / "logs" / "ollama-serve.log",
+            label="OLLAMA",
+            quiet=quiet,
+        )
+
+    # ---- MCP server (FastAPI/uvicorn) ----
+    if mcp_addr not in listening:
+        mcp_root = _find_mcp_root()
         _start_background(
             [_bg_python_executable(), "-m", "uvicorn", "mcp_server:app", "--host", "127.0.0.1", "--port", "8000"],
             cwd=mcp_root,
@@ -281,16 +350,96 @@ def _ensure_background_services(*, quiet: bool = False):
 # -------------------------------------------------
 # Core system imports
 # -------------------------------------------------
-
-from core.cognitive_system import CognitiveSystem
-from utils.printhelp import print_help
+# CognitiveSystem (and the LLM adapter stack behind it) is imported where it is
+# first needed, so `--help` and a venv re-exec don't load it for nothing.
 
 # -------------------------------------------------
-# Collective cognition imports (safe, unused for now)
+# IN-PROCESS DISPATCH
 # -------------------------------------------------
 
-from collective.collective_review import merge_points, reinforce_points
-from collective.collective_points import Point
+_dispatch_system = None
+_dispatch_lock = threading.RLock()
+_capture = threading.local()
+
+
+class _ThreadRoutedStream:
+    """Stands in for sys.stdout/sys.stderr and sends writes from a capturing
+    thread to that thread's own buffer; every other thread (and input()
+    prompts) still reaches the real stream."""
+
+    def __init__(self, real, slot: str):
+        self._real = real
+        self._slot = slot
+
+    def _target(self):
+        return getattr(_capture, self._slot, None) or self._real
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+
+def _install_routed_streams():
+    if not isinstance(sys.stdout, _ThreadRoutedStream):
+        sys.stdout = _ThreadRoutedStream(sys.stdout, "out")
+    if not isinstance(sys.stderr, _ThreadRoutedStream):
+        sys.stderr = _ThreadRoutedStream(sys.stderr, "err")
+
+
+@contextlib.contextmanager
+def _captured(out, err):
+    """Route this thread's stdout/stderr into `out`/`err` for the block."""
+    _install_routed_streams()
+    prev = (getattr(_capture, "out", None), getattr(_capture, "err", None))
+    _capture.out, _capture.err = out, err
+    try:
+        yield
+    finally:
+        _capture.out, _capture.err = prev
+
+
+def get_system():
+    """The shared in-process CognitiveSystem, built once with preflight output hidden."""
+    global _dispatch_system
+    if _dispatch_system is None:
+        with _dispatch_lock:
+            if _dispatch_system is None:
+                from core.cognitive_system import CognitiveSystem
+
+                with _captured(io.StringIO(), io.StringIO()):
+                    _ensure_numpy_for_qtmos(quiet=True)
+                    _ensure_background_services(quiet=True)
+                    _dispatch_system = CognitiveSystem()
+    return _dispatch_system
+
+
+def dispatch(cmd: str, out=None, err=None) -> tuple[int, str, str]:
+    """Run one command against a long-lived in-process system.
+
+    Same contract as `main.py --once CMD` run as a subprocess:
+    returns (returncode, stdout, stderr) with output stripped. Only the
+    calling thread's output is captured, into `out`/`err` when given.
+    """
+    buf_out = out if out is not None else io.StringIO()
+    buf_err = err if err is not None else io.StringIO()
+    rc = 0
+    with _dispatch_lock:
+        with _captured(buf_out, buf_err):
+            try:
+                get_system().handle_command((cmd or "").strip())
+            except SystemExit:
+                pass
+            except Exception as e:
+                print(f"[ONCE ERROR]: {e}")
+                traceback.print_exc()
+                rc = 1
+    return rc, buf_out.getvalue().strip(), buf_err.getvalue().strip()
+
 
 # -------------------------------------------------
 # MAIN ENTRY
@@ -309,8 +458,6 @@ def main(argv: list[str] | None = None):
     """
 
     import argparse
-    import contextlib
-    import io
 
     if argv is None:
         argv = sys.argv[1:]
@@ -329,13 +476,9 @@ def main(argv: list[str] | None = None):
     if once_cmd:
         # One-shot mode: suppress all non-command output.
         # (Preflight + system init can print; we hide it.)
-        buf_out = io.StringIO()
-        buf_err = io.StringIO()
-        with contextlib.redirect_stdout(buf_out), contextlib.redirect_stderr(buf_err):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
             _ensure_expected_venv()
-            _ensure_numpy_for_qtmos(quiet=True)
-            _ensure_background_services(quiet=True)
-            system = CognitiveSystem()
+        system = get_system()
 
         try:
             system.handle_command(once_cmd.strip())
@@ -350,6 +493,13 @@ def main(argv: list[str] | None = None):
     # Interactive mode (unchanged behavior)
     _ensure_expected_venv()
 
+    from core.cognitive_system import CognitiveSystem
+    from utils.printhelp import print_help
+
+    # Collective cognition imports (safe, unused for now)
+    from collective.collective_review import merge_points, reinforce_points  # noqa: F401
+    from collective.collective_points import Point  # noqa: F401
+
     _ensure_numpy_for_qtmos()
     _ensure_background_services()
     _init_line_editing()
@@ -1,7 +1,10 @@
-import requests
+from llm.http_session import new_session
 
 DASH_ENDPOINT = "https://dash.qtmos.com/api/chat"
 
+# Keep-alive session so repeated prompts reuse the TLS connection.
+_SESSION = new_session()
+
 def ask_dash(prompt: str, model="claude-opus-4-6"):
     payload = {
         "message": prompt,
@@ -9,7 +12,7 @@ def ask_dash(prompt: str, model="claude-opus-4-6"):
     }
 
     try:
-        r = requests.post(DASH_ENDPOINT, json=payload, timeout=60)
+        r = _SESSION.post(DASH_ENDPOINT, json=payload, timeout=60)
         r.raise_for_status()
         data = r.json()
 
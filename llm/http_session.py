@@ -0,0 +1,21 @@
+"""Keep-alive requests.Session shared setup for the LLM/HTTP adapters."""
+
+import atexit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Only connection failures are retried; a request that reached the server is
+# never replayed.
+RETRY = Retry(total=2, read=0, status=0, backoff_factor=0.1)
+
+
+def new_session(pool_connections: int = 10, pool_maxsize: int = 10, schemes=("https://",)) -> requests.Session:
+    """A pooled keep-alive Session with the shared retry policy, closed at exit."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=RETRY)
+    for scheme in schemes:
+        session.mount(scheme, adapter)
+    atexit.register(session.close)
+    return session
@@ -1,10 +1,15 @@
+import atexit
 import json
 import os
+import queue
+import re
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed
 from pathlib import Path
 
-import requests
-
 try:
     from dotenv import load_dotenv  # type: ignore
 except Exception:  # pragma: no cover
@@ -45,6 +50,25 @@ def _load_env_fallback(path: Path):
 _load_env_fallback(PROJECT_ROOT / ".env")
 _load_env_fallback(PROJECT_ROOT / "llm" / ".env")
 
+# ---------- HTTP ----------
+# One pooled session for every adapter so repeated calls reuse keep-alive
+# sockets (and TLS sessions for remote hosts). Only connection failures are
+# retried; a slow generation is never replayed. Built on first use so that
+# commands which never touch HTTP don't pay for importing requests.
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session():
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                from llm.http_session import new_session
+
+                _SESSION = new_session(pool_connections=4, pool_maxsize=16, schemes=("http://", "https://"))
+    return _SESSION
+
 # ---------- MCP (local provider hub) ----------
 MCP_BASE_URL = os.getenv("MCP_BASE_URL", "http://127.0.0.1:8000")
 MCP_TIMEOUT = int(os.getenv("MCP_TIMEOUT", "20"))
@@ -53,7 +77,7 @@ MCP_TIMEOUT = int(os.getenv("MCP_TIMEOUT", "20"))
 def call_mcp_chat(prompt: str, model: str | None = None):
     """Call local MCP OpenAI proxy (POST /chat)."""
     try:
-        r = requests.post(
+        r = _session().post(
             f"{MCP_BASE_URL}/chat",
             json={"content": prompt, "model": model},
             timeout=MCP_TIMEOUT,
@@ -64,10 +88,20 @@ def call_mcp_chat(prompt: str, model: str | None = None):
         return None
 
 
+def mcp_health(timeout: float = 2):
+    """GET /health from the local MCP server; the JSON dict, or None if down."""
+    try:
+        r = _session().get(f"{MCP_BASE_URL}/health", headers={"accept": "application/json"}, timeout=timeout)
+        data = r.json()
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return None
+
+
 def call_mcp_gemini(prompt: str, model: str | None = None):
     """Call local MCP Gemini proxy (POST /gemini)."""
     try:
-        r = requests.post(
+        r = _session().post(
             f"{MCP_BASE_URL}/gemini",
             json={"content": prompt, "model": model},
             timeout=MCP_TIMEOUT,
@@ -91,23 +125,48 @@ OLLAMA_MODELS = {
     "default": OLLAMA_MODEL,
 }
 
-def query_ollama(prompt, model: str | None = None):
+def query_ollama_stream(prompt, model: str | None = None):
+    """Yield Ollama response chunks as they are generated.
+
+    Raises on transport/HTTP errors so callers can tell "failed" from "empty".
+    """
     chosen = (model or OLLAMA_MODEL)
-    try:
-        r = requests.post(
+    r = _session().post(
+        f"{OLLAMA_BASE}/api/generate",
+        json={"model": chosen, "prompt": prompt, "stream": True},
+        stream=True,
+        timeout=(5, OLLAMA_TIMEOUT),
+    )
+    # Fallback when a migrated machine has only llama3:latest pulled.
+    if r.status_code == 404 and chosen != "llama3:latest":
+        r.close()
+        r = _session().post(
             f"{OLLAMA_BASE}/api/generate",
-            json={"model": chosen, "prompt": prompt, "stream": False},
-            timeout=OLLAMA_TIMEOUT,
+            json={"model": "llama3:latest", "prompt": prompt, "stream": True},
+            stream=True,
+            timeout=(5, OLLAMA_TIMEOUT),
         )
-        # Fallback when a migrated machine has only llama3:latest pulled.
-        if r.status_code == 404 and chosen != "llama3:latest":
-            r = requests.post(
-                f"{OLLAMA_BASE}/api/generate",
-                json={"model": "llama3:latest", "prompt": prompt, "stream": False},
-                timeout=OLLAMA_TIMEOUT,
-            )
+    with r:
         r.raise_for_status()
-        return r.json().get("response")
+        for line in r.iter_lines():
+            if not line:
+                continue
+            data = json.loads(line)
+            if data.get("error"):
+                raise RuntimeError(data["error"])
+            chunk = data.get("response")
+            if chunk:
+                yield chunk
+            if data.get("done"):
+                break
+            if _race_cancelled():
+                # Another backend won the race; hanging up stops the generation.
+                break
+
+
+def query_ollama(prompt, model: str | None = None):
+    try:
+        return "".join(query_ollama_stream(prompt, model=model))
     except Exception:
         return None
 
@@ -139,6 +198,8 @@ PUTER_MODELS_URL = os.getenv("PUTER_MODELS_URL", "https://api.puter.com/puterai/
 PUTER_NODE_BRIDGE = Path(__file__).resolve().with_name("puter_node_bridge.cjs")
 PUTER_SDK_CHECK_ARG = "@heyputer/puter.js/src/init.cjs"
 PUTER_AUTO_INSTALL_SDK = os.getenv("PUTER_AUTO_INSTALL_SDK", "1") == "1"
+# Serve chat / list-models from one long-lived `node puter_node_bridge.cjs --stdio`.
+PUTER_NODE_WORKER = os.getenv("PUTER_NODE_WORKER", "1") == "1"
 # If the Puter SDK can't authenticate, it may try to open an interactive login flow.
 # Default to disabling that behavior so server/headless usage doesn't pop auth windows.
 PUTER_LOGIN_DISABLE_SDK = os.getenv("PUTER_LOGIN_DISABLE_SDK", "1") == "1"
@@ -159,13 +220,31 @@ PUTER_AUTH_RETRY_DETAIL_MARKERS = (
     "401",
     "403",
 )
+# All detail markers as one alternation; details are lowercased before matching.
+_AUTH_DETAIL_RE = re.compile("|".join(map(re.escape, PUTER_AUTH_RETRY_DETAIL_MARKERS)))
+
+
+_PUTER_SDK_OK = False
+# Router threads can reach Puter concurrently; only one of them probes/installs.
+_PUTER_SDK_LOCK = threading.Lock()
 
 
 def _ensure_puter_sdk() -> bool:
     """Ensure Puter.js Node SDK is resolvable for bridge calls.
 
-    Auto-installs into the project (no-save) when missing.
+    Auto-installs into the project (no-save) when missing. A positive answer
+    is remembered, so the `node -e require.resolve` probe runs once per process.
     """
+    global _PUTER_SDK_OK
+    if _PUTER_SDK_OK:
+        return True
+    with _PUTER_SDK_LOCK:
+        if not _PUTER_SDK_OK:
+            _PUTER_SDK_OK = _probe_puter_sdk()
+    return _PUTER_SDK_OK
+
+
+def _probe_puter_sdk() -> bool:
     if not PUTER_NODE_BRIDGE.exists():
         return False
 
@@ -210,18 +289,30 @@ def _ensure_puter_sdk() -> bool:
         return False
 
 
+# (raw env value, cleaned token) from the last _puter_token() call.
+_PUTER_TOKEN_CACHE = ("", "")
+
+
 def _puter_token():
+    global _PUTER_TOKEN_CACHE
     token = os.getenv("puterAuthToken") or os.getenv("PUTER_AUTH_TOKEN") or ""
+    raw, clean = _PUTER_TOKEN_CACHE
+    if token == raw:
+        return clean
     # Strip accidental whitespace/newlines from pasted tokens.
-    return "".join(str(token).split())
+    clean = "".join(str(token).split())
+    _PUTER_TOKEN_CACHE = (token, clean)
+    return clean
 
 
 def _set_puter_token(token: str | None):
+    global _PUTER_TOKEN_CACHE
     clean = "".join(str(token or "").split())
     if not clean:
         return ""
     os.environ["puterAuthToken"] = clean
     os.environ["PUTER_AUTH_TOKEN"] = clean
+    _PUTER_TOKEN_CACHE = (clean, clean)
     return clean
 
 
@@ -256,6 +347,136 @@ def _extract_chat_content(payload):
     return None
 
 
+def _parse_bridge_output(out: str):
+    # Prefer full payload parse, then last JSON-looking line as fallback.
+    for candidate in [out] + [line.strip() for line in out.splitlines()[::-1]]:
+        if not candidate:
+            continue
+        if not (candidate.startswith("{") and candidate.endswith("}")):
+            continue
+        try:
+            return json.loads(candidate)
+        except Exception:
+            continue
+    return None
+
+
+class _PuterNodeWorker:
+    """A persistent `puter_node_bridge.cjs --stdio` process.
+
+    Requests go out one at a time as JSON lines and are matched to replies by
+    id, so node startup and SDK loading are paid once instead of per call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._proc = None
+        self._lines = None
+        self._pump = None
+        self._next_id = 0
+
+    def _start(self):
+        proc = subprocess.Popen(
+            ["node", str(PUTER_NODE_BRIDGE), "--stdio"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        lines: queue.Queue = queue.Queue()
+
+        def pump():
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)
+
+        t = threading.Thread(target=pump, name="puter-node-worker", daemon=True)
+        t.start()
+        self._proc, self._lines, self._pump = proc, lines, t
+
+    def request(self, argv: list[str], token: str, timeout: float):
+        """Send one bridge request; None on timeout or worker exit.
+
+        Raises OSError when node cannot be started at all. A call that loses a
+        router race gives up (None) instead of holding the worker: a reply
+        that turns up later is skipped by id.
+        """
+        while not self._lock.acquire(timeout=0.1):
+            if _race_cancelled():
+                return None
+        try:
+            self._next_id += 1
+            rid = self._next_id
+            request = json.dumps({"id": rid, "argv": argv, "token": token}) + "\n"
+            # Health check on borrow: a worker that died while idle is only
+            # noticed when the write fails. Nothing reached node then, so the
+            # request is safe to resend once on a fresh worker.
+            for attempt in (1, 2):
+                if self._proc is None or self._proc.poll() is not None:
+                    self._close_locked()
+                    self._start()
+                try:
+                    self._proc.stdin.write(request)
+                    self._proc.stdin.flush()
+                    break
+                except OSError:
+                    self._close_locked()
+                    if attempt == 2:
+                        return None
+
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    line = self._lines.get(timeout=max(0.0, min(remaining, 0.1)))
+                except queue.Empty:
+                    if _race_cancelled():
+                        return None
+                    if remaining > 0.1:
+                        continue
+                    line = None
+                if line is None:
+                    # Timed out or exited: a fresh worker serves the next call.
+                    self._close_locked()
+                    return None
+                payload = _parse_bridge_output(line.strip())
+                # Lines without our id are SDK chatter or stale replies.
+                if isinstance(payload, dict) and payload.get("id") == rid:
+                    payload.pop("id", None)
+                    return payload
+        finally:
+            self._lock.release()
+
+    def _close_locked(self):
+        proc, self._proc, self._lines = self._proc, None, None
+        pump, self._pump = self._pump, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=2)
+        except Exception:
+            pass
+        # Once node is reaped the pump hits EOF; then release the pipe fds.
+        if pump is not None:
+            pump.join(timeout=2)
+        for stream in (proc.stdin, proc.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+
+_PUTER_WORKER = _PuterNodeWorker()
+atexit.register(_PUTER_WORKER.close)
+
+
 def _run_puter_node_bridge(argv: list[str], require_token: bool = True):
     token = _puter_token()
     if require_token and not token:
@@ -263,6 +484,13 @@ def _run_puter_node_bridge(argv: list[str], require_token: bool = True):
     if not _ensure_puter_sdk():
         return None
 
+    # auth-token opens an interactive browser flow; keep that one-shot.
+    if PUTER_NODE_WORKER and argv and argv[0] in ("chat", "list-models"):
+        try:
+            return _PUTER_WORKER.request(argv, token, timeout=max(15, PUTER_TIMEOUT + 10))
+        except OSError:
+            pass
+
     env = os.environ.copy()
     if token:
         env.setdefault("puterAuthToken", token)
@@ -282,18 +510,7 @@ def _run_puter_node_bridge(argv: list[str], require_token: bool = True):
     out = (r.stdout or "").strip()
     if not out:
         return None
-
-    # Prefer full payload parse, then last JSON-looking line as fallback.
-    for candidate in [out] + [line.strip() for line in out.splitlines()[::-1]]:
-        if not candidate:
-            continue
-        if not (candidate.startswith("{") and candidate.endswith("}")):
-            continue
-        try:
-            return json.loads(candidate)
-        except Exception:
-            continue
-    return None
+    return _parse_bridge_output(out)
 
 
 def _bridge_error(payload):
@@ -315,7 +532,7 @@ def _is_bridge_auth_failure(payload):
 
     # Some providers only include auth/session hints in detail text.
     detail = _bridge_detail(payload)
-    if detail and any(mark in detail for mark in PUTER_AUTH_RETRY_DETAIL_MARKERS):
+    if detail and _AUTH_DETAIL_RE.search(detail):
         return True
 
     return False
@@ -386,7 +603,7 @@ def call_puter_with_model(prompt: str, model: str | None = None):
     if PUTER_KEY:
         for chosen in candidates:
             try:
-                r = requests.post(
+                r = _session().post(
                     PUTER_API,
                     headers=_puter_headers(),
                     json={
@@ -429,9 +646,9 @@ def list_puter_models(provider: str | None = None):
 
     for url in endpoints:
         try:
-            r = requests.get(url, params=params, headers=_puter_headers(), timeout=PUTER_TIMEOUT)
+            r = _session().get(url, params=params, headers=_puter_headers(), timeout=PUTER_TIMEOUT)
             if r.status_code in (401, 403):
-                r = requests.get(url, params=params, timeout=PUTER_TIMEOUT)
+                r = _session().get(url, params=params, timeout=PUTER_TIMEOUT)
             r.raise_for_status()
             data = r.json()
             if isinstance(data, list):
@@ -474,30 +691,247 @@ class GeminiAdapter:
         except:
             return None
 
-_gemini = GeminiAdapter()
+# google.genai is slow to import; the adapter is only built once a router
+# call can actually use Gemini (i.e. not in local-only mode).
+_gemini: GeminiAdapter | None = None
+_gemini_lock = threading.Lock()
+
+
+def _get_gemini() -> GeminiAdapter:
+    global _gemini
+    if _gemini is None:
+        with _gemini_lock:
+            if _gemini is None:
+                _gemini = GeminiAdapter()
+    return _gemini
 
 # ---------- ROUTER ----------
+# Prompts are classified into ordered backend tiers. Backends within a tier are
+# raced concurrently; the first non-empty reply wins instead of waiting out each
+# provider's timeout in turn.
+ROUTER_TIMEOUT = int(os.getenv("QTM_ROUTER_TIMEOUT", str(max(PUTER_TIMEOUT, OLLAMA_TIMEOUT) + 10)))
+ROUTER_CACHE_SIZE = int(os.getenv("QTM_ROUTER_CACHE_SIZE", "512"))
+ROUTER_CACHE_TTL = float(os.getenv("QTM_ROUTER_CACHE_TTL", "300"))
+# Backend calls run on their own pool; a race loser that is still running
+# finishes (or hangs up) there without holding one of the race's slots.
+ROUTER_BACKEND_WORKERS = int(os.getenv("QTM_ROUTER_BACKEND_WORKERS", "6"))
+# Circuit breaker: after N consecutive failures a backend is skipped for a while.
+ROUTER_BREAKER_FAILS = int(os.getenv("QTM_ROUTER_BREAKER_FAILS", "3"))
+ROUTER_BREAKER_SECONDS = float(os.getenv("QTM_ROUTER_BREAKER_SECONDS", "30"))
+
+# Prompts up to this many characters with no reasoning/code markers go local first.
+ROUTER_FAST_CHARS = int(os.getenv("QTM_ROUTER_FAST_CHARS", "280"))
+ROUTER_REASONING_CHARS = int(os.getenv("QTM_ROUTER_REASONING_CHARS", "2000"))
+ROUTER_EWMA_ALPHA = 0.3
+# In a tier that mixes local and remote backends, Ollama gets this many seconds
+# to answer alone before the remote calls are fanned out.
+ROUTER_LOCAL_HEAD_START = float(os.getenv("QTM_ROUTER_LOCAL_HEAD_START", "1.5"))
+
+# Prompt class -> backend tiers. Each tier is raced; later tiers are fallbacks.
+ROUTER_TIERS = {
+    "fast": (("ollama",), ("puter", "gemini")),
+    "balanced": (("ollama", "puter", "gemini"),),
+    "reasoning": (("puter", "gemini"), ("ollama",)),
+}
+
+_REASONING_RE = re.compile(
+    r"```|\b(code|python|javascript|bug|stacktrace|traceback|refactor|reason|analy[sz]e"
+    r"|proof|math|logic|plan|strategy|compare|explain why|step by step)\b",
+    re.IGNORECASE,
+)
+
+_router_pool: ThreadPoolExecutor | None = None
+_backend_pool: ThreadPoolExecutor | None = None
+_router_lock = threading.Lock()
+_router_cache: OrderedDict = OrderedDict()
+_router_failures: dict[str, tuple[int, float]] = {}
+_router_latency: dict[str, float] = {}
+# Per worker thread: the cancel event of the race it is currently running for.
+_race_state = threading.local()
+
+
+def _race_cancelled() -> bool:
+    ev = getattr(_race_state, "cancel", None)
+    return ev is not None and ev.is_set()
+
+
+def _router_executor() -> ThreadPoolExecutor:
+    global _router_pool
+    with _router_lock:
+        if _router_pool is None:
+            _router_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="ask-router")
+        return _router_pool
+
+
+def _backend_executor() -> ThreadPoolExecutor:
+    global _backend_pool
+    with _router_lock:
+        if _backend_pool is None:
+            _backend_pool = ThreadPoolExecutor(
+                max_workers=max(1, ROUTER_BACKEND_WORKERS), thread_name_prefix="router-backend"
+            )
+        return _backend_pool
+
+
+def _breaker_open(name: str) -> bool:
+    fails, until = _router_failures.get(name, (0, 0.0))
+    return fails >= ROUTER_BREAKER_FAILS and time.monotonic() < until
+
+
+def _record_result(name: str, ok: bool):
+    with _router_lock:
+        if ok:
+            _router_failures.pop(name, None)
+            return
+        fails, _until = _router_failures.get(name, (0, 0.0))
+        _router_failures[name] = (fails + 1, time.monotonic() + ROUTER_BREAKER_SECONDS)
+
+
+def _run_backend(fn, prompt: str, cancel: threading.Event | None):
+    _race_state.cancel = cancel
+    try:
+        return fn(prompt)
+    except Exception:
+        return None
+    finally:
+        _race_state.cancel = None
+
+
+def _call_backend(name: str, fn, prompt: str, cancel: threading.Event | None = None):
+    t0 = time.monotonic()
+    call = _backend_executor().submit(_run_backend, fn, prompt, cancel)
+    while True:
+        try:
+            resp = call.result(timeout=0.05)
+            break
+        except FuturesTimeout:
+            if cancel is not None and cancel.is_set():
+                return None
+    if cancel is not None and cancel.is_set():
+        # Lost the race (possibly cut short); says nothing about backend health.
+        return None
+    _record_result(name, bool(resp))
+    if resp:
+        elapsed = time.monotonic() - t0
+        with _router_lock:
+            prev = _router_latency.get(name)
+            _router_latency[name] = elapsed if prev is None else (
+                ROUTER_EWMA_ALPHA * elapsed + (1 - ROUTER_EWMA_ALPHA) * prev
+            )
+    return resp
+
+
+def _classify(prompt: str) -> str:
+    """Classify a prompt as "fast", "balanced" or "reasoning" for routing."""
+    text = prompt or ""
+    if len(text) >= ROUTER_REASONING_CHARS or _REASONING_RE.search(text):
+        return "reasoning"
+    if len(text) <= ROUTER_FAST_CHARS:
+        return "fast"
+    return "balanced"
+
+
+def _router_backends(local_only: bool) -> dict[str, object]:
+    backends = {}
+    if not local_only:
+        backends["puter"] = call_puter
+    backends["ollama"] = query_ollama
+    if not local_only:
+        gemini = _get_gemini()
+        if gemini.enabled:
+            backends["gemini"] = gemini.ask
+    return {name: fn for name, fn in backends.items() if not _breaker_open(name)}
+
+
+def _race(backends: list[tuple[str, object]], prompt: str, head_start: float = 0.0):
+    """First non-empty reply of `backends`, as (reply, name); None if none.
+
+    With a head start the first backend runs alone for that many seconds and
+    the others are only called if it has not answered by then.
+    """
+    pool = _router_executor()
+    cancel = threading.Event()
+    lead = backends[:1] if head_start > 0 else backends
+    futures = {pool.submit(_call_backend, name, fn, prompt, cancel): name for name, fn in lead}
+    try:
+        if len(lead) < len(backends):
+            first = next(iter(futures))
+            try:
+                resp = first.result(timeout=head_start)
+            except FuturesTimeout:
+                resp = None
+            if resp:
+                return resp, futures[first]
+            for name, fn in backends[len(lead):]:
+                futures[pool.submit(_call_backend, name, fn, prompt, cancel)] = name
+        for fut in as_completed(futures, timeout=ROUTER_TIMEOUT):
+            resp = fut.result()
+            if resp:
+                return resp, futures[fut]
+    except FuturesTimeout:
+        pass
+    finally:
+        # Losers that have not started are dropped, running ones are left to
+        # the backend pool: streaming ones hang up, Puter drops the worker.
+        cancel.set()
+        for fut in futures:
+            fut.cancel()
+    return None
+
+
 def ask_router(prompt):
     """Route a prompt to an available engine.
 
+    The prompt is classified (see _classify) to pick an ordered list of
+    backend tiers: short/simple prompts try local Ollama first, reasoning or
+    code prompts go to remote providers first. Backends within a tier run
+    concurrently (lowest observed latency submitted first) and the first
+    non-empty reply wins; later tiers are fallbacks. In a tier mixing Ollama
+    with remote providers, Ollama gets ROUTER_LOCAL_HEAD_START seconds alone. Successful replies are
+    kept in a small LRU cache keyed on the prompt for ROUTER_CACHE_TTL seconds.
+
     Local-only mode:
       If QTM_LOCAL_ONLY=1 (default), skip external providers and only try Ollama.
     """
 
     local_only = os.getenv("QTM_LOCAL_ONLY", "1") == "1"
-
-    if not local_only:
-        resp = call_puter(prompt)
-        if resp:
-            return resp, "puter"
-
-    resp = query_ollama(prompt)
-    if resp:
-        return resp, "ollama"
-
-    if (not local_only) and _gemini.enabled:
-        resp = _gemini.ask(prompt)
-        if resp:
-            return resp, "gemini"
-
-    return None, "none"
+    key = (local_only, prompt)
+
+    if ROUTER_CACHE_SIZE > 0:
+        with _router_lock:
+            hit = _router_cache.get(key)
+            if hit is not None:
+                expires, cached = hit
+                if time.monotonic() < expires:
+                    _router_cache.move_to_end(key)
+                    return cached
+                del _router_cache[key]
+
+    backends = _router_backends(local_only)
+    result = None
+    for tier in ROUTER_TIERS[_classify(prompt)]:
+        names = sorted(
+            (name for name in tier if name in backends),
+            key=lambda name: _router_latency.get(name, 0.0),
+        )
+        if not names:
+            continue
+        head_start = 0.0
+        if "ollama" in names and len(names) > 1:
+            names.remove("ollama")
+            names.insert(0, "ollama")
+            head_start = ROUTER_LOCAL_HEAD_START
+        result = _race([(name, backends[name]) for name in names], prompt, head_start)
+        if result is not None:
+            break
+
+    if result is None:
+        return None, "none"
+
+    if ROUTER_CACHE_SIZE > 0:
+        with _router_lock:
+            _router_cache[key] = (time.monotonic() + ROUTER_CACHE_TTL, result)
+            _router_cache.move_to_end(key)
+            while len(_router_cache) > ROUTER_CACHE_SIZE:
+                _router_cache.popitem(last=False)
+    return result
@@ -144,60 +144,58 @@ function extractContent(resp) {
   return null;
 }
 
-async function main() {
-  const mode = process.argv[2];
-  const args = parseArgs(process.argv.slice(3));
-  const sdk = loadSdk();
+let cachedPuter = null;
+let cachedToken = null;
+
+function initPuter(sdk, token) {
+  // A long-lived --stdio worker reuses one client per token.
+  if (!cachedPuter || cachedToken !== token) {
+    cachedPuter = sdk.init(token);
+    cachedToken = token;
+  }
+  return cachedPuter;
+}
 
+async function handle(sdk, mode, args, tokenRaw) {
   if (!mode) {
-    fail("MISSING_MODE");
-    return;
+    return { ok: false, error: "MISSING_MODE" };
   }
 
   if (!sdk) {
-    fail("MISSING_PUTER_SDK");
-    return;
+    return { ok: false, error: "MISSING_PUTER_SDK" };
   }
 
   if (mode === "auth-token") {
     if (typeof sdk.getAuthToken !== "function") {
-      fail("MISSING_GET_AUTH_TOKEN");
-      return;
+      return { ok: false, error: "MISSING_GET_AUTH_TOKEN" };
     }
     try {
       const token = sanitizeToken(await sdk.getAuthToken());
       if (!token) {
-        fail("EMPTY_AUTH_TOKEN");
-        return;
+        return { ok: false, error: "EMPTY_AUTH_TOKEN" };
       }
       if (looksLikePlaceholder(token)) {
-        fail("INVALID_TOKEN_PLACEHOLDER");
-        return;
+        return { ok: false, error: "INVALID_TOKEN_PLACEHOLDER" };
       }
-      emit({ ok: true, token });
+      return { ok: true, token };
     } catch (err) {
-      fail("AUTH_BOOTSTRAP_FAILED", { detail: detail(err) });
+      return { ok: false, error: "AUTH_BOOTSTRAP_FAILED", detail: detail(err) };
     }
-    return;
   }
 
-  const tokenRaw = process.env.puterAuthToken || process.env.PUTER_AUTH_TOKEN || "";
   const token = sanitizeToken(tokenRaw);
   if (!token) {
-    fail("MISSING_AUTH_TOKEN");
-    return;
+    return { ok: false, error: "MISSING_AUTH_TOKEN" };
   }
   if (looksLikePlaceholder(token)) {
-    fail("INVALID_TOKEN_PLACEHOLDER");
-    return;
+    return { ok: false, error: "INVALID_TOKEN_PLACEHOLDER" };
   }
 
   let puter;
   try {
-    puter = sdk.init(token);
+    puter = initPuter(sdk, token);
   } catch (err) {
-    fail("INIT_FAILED", { detail: detail(err) });
-    return;
+    return { ok: false, error: "INIT_FAILED", detail: detail(err) };
   }
 
   try {
@@ -205,42 +203,97 @@ async function main() {
       const model = args.model || "claude-opus-4-6";
       const prompt = args.prompt || "";
       if (!prompt) {
-        fail("MISSING_PROMPT");
-        return;
+        return { ok: false, error: "MISSING_PROMPT" };
       }
       const resp = await puter.ai.chat(prompt, { model });
       const content = extractContent(resp);
       if (!content) {
-        fail("EMPTY_CONTENT", { raw_type: typeof resp });
-        return;
+        return { ok: false, error: "EMPTY_CONTENT", raw_type: typeof resp };
       }
-      emit({ ok: true, content, model });
-      return;
+      return { ok: true, content, model };
     }
 
     if (mode === "list-models") {
       const provider = args.provider || null;
       const models = await puter.ai.listModels(provider);
-      emit({
+      return {
         ok: Array.isArray(models),
         models: Array.isArray(models) ? models : [],
         provider,
-      });
-      return;
+      };
     }
 
-    fail("UNKNOWN_MODE");
+    return { ok: false, error: "UNKNOWN_MODE" };
   } catch (err) {
-    fail("RUNTIME_FAILED", { detail: detail(err) });
+    return { ok: false, error: "RUNTIME_FAILED", detail: detail(err) };
+  }
+}
+
+// --stdio: one JSON request per stdin line ({id, argv, token}), answered in
+// order with one JSON line each, echoing the id. Lets callers keep a single
+// node process (and SDK load) across many chat / list-models calls.
+function serve() {
+  const sdk = loadSdk();
+  const rl = require("readline").createInterface({ input: process.stdin });
+  let chain = Promise.resolve();
+  rl.on("line", (line) => {
+    chain = chain.then(async () => {
+      let req;
+      try {
+        req = JSON.parse(line);
+      } catch (_err) {
+        emit({ ok: false, error: "BAD_REQUEST" });
+        return;
+      }
+      const argv = Array.isArray(req.argv) ? req.argv.map(String) : [];
+      let payload;
+      try {
+        payload = await handle(sdk, argv[0], parseArgs(argv.slice(1)), req.token || "");
+      } catch (err) {
+        payload = { ok: false, error: "RUNTIME_FAILED", detail: detail(err) };
+      }
+      emit({ id: req.id, ...payload });
+    });
+  });
+  rl.on("close", () => {
+    chain.then(() => process.exit(0));
+  });
+}
+
+const STDIO = process.argv[2] === "--stdio";
+
+async function main() {
+  if (STDIO) {
+    serve();
+    return;
+  }
+  const mode = process.argv[2];
+  const args = parseArgs(process.argv.slice(3));
+  const tokenRaw = process.env.puterAuthToken || process.env.PUTER_AUTH_TOKEN || "";
+  const payload = await handle(loadSdk(), mode, args, tokenRaw);
+  if (payload.ok === false && payload.error) {
+    const { ok: _ok, error, ...extra } = payload;
+    fail(error, extra);
+    return;
+  }
+  emit(payload);
+}
+
+// A worker must outlive one bad request; a one-shot run reports only the first failure.
+function report(error, reason) {
+  if (STDIO) {
+    emit({ ok: false, error, detail: detail(reason) });
+  } else {
+    fail(error, { detail: detail(reason) });
   }
 }
 
 process.on("unhandledRejection", (reason) => {
-  fail("UNHANDLED_REJECTION", { detail: detail(reason) });
+  report("UNHANDLED_REJECTION", reason);
 });
 
 process.on("uncaughtException", (err) => {
-  fail("UNCAUGHT_EXCEPTION", { detail: detail(err) });
+  report("UNCAUGHT_EXCEPTION", err);
 });
 
 main();
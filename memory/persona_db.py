@@ -1,5 +1,6 @@
 from pathlib import Path
 import json
+import os
 import time
 
 from memory_models import CortexPack, EpisodicPack, ProfilePack
@@ -8,6 +9,19 @@ from typing import Dict, Any, List, Optional
 
 
 
+def list_packs(d: Path, suffix=".json") -> List[str]:
+    """Paths of the files in d whose name ends in suffix.
+
+    scandir reuses the dirent type, so this is one directory read rather
+    than a stat per entry (glob/iterdir + is_file). A missing dir lists empty.
+    """
+    try:
+        with os.scandir(d) as it:
+            return [e.path for e in it if e.name.endswith(suffix) and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
 class PersonalityDB:
     """
     Simple loader/index over:
@@ -50,10 +64,8 @@ class PersonalityDB:
     # ---------- episodic ----------
 
     def list_episodic(self) -> List[str]:
-        if not self.persona_dir.exists():
-            return []
         names = []
-        for p in self.persona_dir.glob("*.json"):
+        for p in map(Path, list_packs(self.persona_dir)):
             # keep your naming vibe: packX_episodic.json etc.
             if "episodic" in p.name.lower() or "pack" in p.name.lower():
                 names.append(p.stem)
@@ -116,9 +128,7 @@ class PersonalityDB:
     # ---------- profiles ----------
 
     def list_profiles(self) -> List[str]:
-        if not self.profile_dir.exists():
-            return []
-        return sorted([p.stem for p in self.profile_dir.glob("*.json")])
+        return sorted(Path(p).stem for p in list_packs(self.profile_dir))
 
     def load_profile(self, name: str) -> ProfilePack:
         name = (name or "").strip().strip('"').strip("'")
@@ -1,10 +1,25 @@
 # recursiveLearning.py
 
+import atexit
 import threading
 import os
 import json
 import time
 import logging
+from collections import deque
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# Writes are coalesced: flush after this many seconds without a new insert,
+# or immediately once this many inserts are pending.
+FLUSH_DELAY = 1.0
+FLUSH_MAX_PENDING = 50
+
+# Episodic history is a rolling window; the oldest entries are evicted.
+EPISODIC_MAX = 900
 
 
 class RecursiveLearning:
@@ -12,21 +27,31 @@ class RecursiveLearning:
         self.core_file = core_file
         self.epi_file = epi_file
         self.core_learning_history = []
-        self.episodic_learning_history = []
+        self.episodic_learning_history = deque(maxlen=EPISODIC_MAX)
         self._lock = threading.Lock()
         self._is_core_dirty = False
         self._is_episodic_dirty = False
+        self._pending = 0
+        self._flush_timer = None
         self.load_memory()
+        atexit.register(self.flush)
 
     def _load_file(self, path, target_attr):
         if not os.path.exists(path):
             return
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
         if isinstance(data, dict) and "learning_history" in data:
-            setattr(self, target_attr, data["learning_history"])
-        elif isinstance(data, list):
-            setattr(self, target_attr, data)
+            data = data["learning_history"]
+        elif not isinstance(data, list):
+            return
+        if target_attr == "episodic_learning_history":
+            data = deque(data, maxlen=EPISODIC_MAX)
+        setattr(self, target_attr, data)
 
     def load_memory(self):
         try:
@@ -39,16 +64,28 @@ class RecursiveLearning:
         except Exception as e:
             print("[SYSTEM WARNING]: Could not load memory, starting blank.", e)
             self.core_learning_history = []
-            self.episodic_learning_history = []
+            self.episodic_learning_history = deque(maxlen=EPISODIC_MAX)
 
-    def _save_file(self, path, data):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(
-                {"learning_history": data, "last_saved": time.time()},
-                f,
-                indent=2,
-                ensure_ascii=False,
-            )
+    def _save_file(self, path, data, pretty=False):
+        # Write a sibling temp file and swap it in, so a crash mid-write
+        # never leaves a truncated pack behind.
+        payload = {"learning_history": data, "last_saved": time.time()}
+        tmp = f"{path}.tmp"
+        try:
+            if orjson is not None:
+                option = orjson.OPT_INDENT_2 if pretty else 0
+                with open(tmp, "wb") as f:
+                    f.write(orjson.dumps(payload, option=option))
+            else:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, indent=2 if pretty else None, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
 
     def save_memory(self):
         with self._lock:
@@ -57,12 +94,34 @@ class RecursiveLearning:
                     self._save_file(self.core_file, self.core_learning_history)
                     self._is_core_dirty = False
                 if self._is_episodic_dirty:
-                    self._save_file(self.epi_file, self.episodic_learning_history)
+                    self._save_file(self.epi_file, list(self.episodic_learning_history))
                     self._is_episodic_dirty = False
             except Exception:
                 print("[SYSTEM CRITICAL ERROR]: FAILED TO SAVE MEMORY.")
                 logging.error("Memory save failed", exc_info=True)
 
+    def _schedule_flush(self):
+        with self._lock:
+            self._pending += 1
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._pending < FLUSH_MAX_PENDING:
+                self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """Write any pending changes now (also runs at interpreter exit)."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending = 0
+        self.save_memory()
+
     def add_episodic_memory(self, packet):
         with self._lock:
             text = (packet.get("input") or "")
@@ -70,16 +129,14 @@ class RecursiveLearning:
                 print("[MEMORY SAFETY]: Blocking recursive synthesis learn.")
                 return
             self.episodic_learning_history.append(packet)
-            if len(self.episodic_learning_history) > 900:
-                self.episodic_learning_history.pop(0)
             self._is_episodic_dirty = True
-        self.save_memory()
+        self._schedule_flush()
 
     def add_core_memory(self, packet):
         with self._lock:
             self.core_learning_history.append(packet)
             self._is_core_dirty = True
-        self.save_memory()
+        self._schedule_flush()
 
     def reload_core(self, new_core_file: str):
         with self._lock:
@@ -0,0 +1,129 @@
+"""LearningSystem: journaled inserts replay on load and fold into the packs."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core.cognitive_system import LearningSystem  # noqa: E402
+
+
+def _pack_inputs(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return [m["input"] for m in json.load(f)["learning_history"]]
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.core = os.path.join(tmp.name, "core.json")
+        self.epi = os.path.join(tmp.name, "packs", "epi.json")
+        self.systems = []
+        self.addCleanup(self.settle)
+
+    def settle(self):
+        # Leave nothing journaled for the atexit compaction to write later.
+        for ls in self.systems:
+            ls.flush()
+            ls._journaled = 0
+
+    def system(self) -> LearningSystem:
+        ls = LearningSystem(self.core, self.epi)
+        self.systems.append(ls)
+        return ls
+
+    def test_journal_replays_on_load(self):
+        ls = self.system()
+        ls.add_episodic("first")
+        ls.add_episodic("second")
+        ls.promote_to_core("kept")
+        ls.flush()
+        self.assertTrue(os.path.exists(LearningSystem._journal_path(self.epi)))
+        self.assertFalse(os.path.exists(self.epi))
+
+        again = self.system()
+        self.assertEqual([m["input"] for m in again.episodic_learning_history], ["first", "second"])
+        self.assertEqual([m["input"] for m in again.core_learning_history], ["kept"])
+        self.assertEqual(again._journaled, 3)
+        self.assertEqual(again.find_episodic("SEC"), [(2, {"input": "second"})])
+
+    def test_compaction_round_trip(self):
+        ls = self.system()
+        ls.add_episodic("first")
+        ls.promote_to_core("kept")
+        ls.compact()
+        self.assertEqual(_pack_inputs(self.epi), ["first"])
+        self.assertEqual(_pack_inputs(self.core), ["kept"])
+        self.assertFalse(os.path.exists(LearningSystem._journal_path(self.epi)))
+        self.assertFalse(os.path.exists(self.epi + ".tmp"))
+
+        ls.add_episodic("after")
+        ls.flush()
+        again = self.system()
+        self.assertEqual([m["input"] for m in again.episodic_learning_history], ["first", "after"])
+        again.compact()
+        self.assertEqual(_pack_inputs(self.epi), ["first", "after"])
+
+    def test_insert_during_swap_is_kept(self):
+        ls = self.system()
+        other = os.path.join(os.path.dirname(self.epi), "other.json")
+        load_pack = ls._load_pack
+
+        def load_with_insert(path):
+            # Lands after set_epi_file's flush(), before the swap.
+            ls.add_episodic("in flight")
+            return load_pack(path)
+
+        with mock.patch.object(ls, "_load_pack", side_effect=load_with_insert):
+            ls.set_epi_file(other)
+        ls.add_episodic("after swap")
+        ls.compact()
+
+        self.assertEqual(_pack_inputs(other), ["after swap"])
+        old = LearningSystem(self.core, self.epi)
+        self.systems.append(old)
+        self.assertEqual([m["input"] for m in old.episodic_learning_history], ["in flight"])
+
+    def test_compaction_keeps_writes_for_swapped_out_pack(self):
+        ls = self.system()
+        other = os.path.join(os.path.dirname(self.epi), "other.json")
+        stale = (ls._gen, self.epi, {"input": "queued for old pack"})
+        ls.set_epi_file(other)
+        ls.add_episodic("new pack")
+        ls.flush()
+        ls.save_memory()
+        # Processed only after the new pack's snapshot bumped the generation.
+        ls._write_batch([stale])
+        ls._journaled = 0
+        self.assertEqual(
+            [m["input"] for m in ls._load_journal(self.epi)], ["queued for old pack"]
+        )
+        self.assertEqual(_pack_inputs(other), ["new pack"])
+
+    def test_failed_swap_keeps_pack_and_journal(self):
+        ls = self.system()
+        ls.add_episodic("first")
+        ls.compact()
+        ls.add_episodic("second")
+        ls.flush()
+        with mock.patch("core.cognitive_system.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                ls.save_memory()
+        self.assertEqual(_pack_inputs(self.epi), ["first"])
+        self.assertFalse(os.path.exists(self.epi + ".tmp"))
+        again = self.system()
+        self.assertEqual([m["input"] for m in again.episodic_learning_history], ["first", "second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""`a; b; c` lines of delegated V3 commands go to V3 as one batch."""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from core import cognitive_system as cs  # noqa: E402
+
+# A stand-in V3 REPL: echoes each command, rejects sentinels like V3 does.
+FAKE_V3 = textwrap.dedent(
+    """
+    while True:
+        try:
+            line = input().strip()
+        except EOFError:
+            break
+        if line == "quit":
+            break
+        if line.startswith("__qtm_"):
+            print(f"[UNKNOWN COMMAND]: '{line}'")
+            continue
+        print(f"ran {line}")
+    """
+)
+
+
+class HandleCommandBatchTest(unittest.TestCase):
+    def setUp(self):
+        # handle_command only needs the class-level command table.
+        self.system = object.__new__(cs.CognitiveSystem)
+
+    def test_all_delegated_segments_batch(self):
+        with mock.patch.object(cs.CognitiveSystem, "command_compat_legacy_batch") as batch:
+            self.system.handle_command("qhace; Rails ;forget x;")
+        batch.assert_called_once_with(["qhace", "Rails", "forget x"])
+
+    def test_mixed_line_is_not_batched(self):
+        with mock.patch.object(cs.CognitiveSystem, "command_compat_legacy_batch") as batch, \
+                mock.patch.object(cs.CognitiveSystem, "command_learn") as learn:
+            self.system.handle_command("learn a; qhace")
+        batch.assert_not_called()
+        learn.assert_called_once_with("a; qhace")
+
+    def test_single_delegated_command_is_not_batched(self):
+        with mock.patch.object(cs.CognitiveSystem, "command_compat_legacy_batch") as batch, \
+                mock.patch.object(cs.CognitiveSystem, "command_compat_legacy") as single:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.system.handle_command("qhace;")
+        batch.assert_not_called()
+        single.assert_not_called()  # "qhace;" is not a command name
+
+
+class LegacyBatchRunTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        script = Path(tmp.name) / "CognitiveSystems_V3.py"
+        script.write_text(FAKE_V3, encoding="utf-8")
+        worker = cs._LegacyWorker()
+        self.addCleanup(worker.close)
+        for patch in (
+            mock.patch.object(cs, "LEGACY_V3_PATH", script),
+            mock.patch.object(cs, "_LEGACY_WORKER", worker),
+            mock.patch.dict(os.environ, {"QTM_LEGACY_PY": sys.executable}),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.system = object.__new__(cs.CognitiveSystem)
+
+    def check(self):
+        results = self.system._run_legacy_batch(["qhace", "rails", "forget x"], timeout=20)
+        self.assertEqual([r[1].strip() for r in results], ["ran qhace", "ran rails", "ran forget x"])
+        self.assertTrue(all(r[0] for r in results))
+
+    def test_worker_batch(self):
+        with mock.patch.object(cs, "LEGACY_WORKER", True):
+            self.check()
+            self.check()  # same process, fresh sentinels
+
+    def test_one_shot_batch(self):
+        with mock.patch.object(cs, "LEGACY_WORKER", False):
+            self.check()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+"""ask_router: racing, cancellation of losers, caching."""
+
+from __future__ import annotations
+
+import queue
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from llm import llm_adapters as a  # noqa: E402
+
+
+def _reset_router():
+    with a._router_lock:
+        a._router_cache.clear()
+        a._router_failures.clear()
+        a._router_latency.clear()
+
+
+class RaceTest(unittest.TestCase):
+    def setUp(self):
+        _reset_router()
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def slow(self, prompt):
+        self.release.wait(5)
+        return "slow"
+
+    def test_winner_returns_without_waiting_for_loser(self):
+        t0 = time.monotonic()
+        result = a._race([("slow", self.slow), ("fast", lambda p: "fast")], "hi")
+        self.assertEqual(result, ("fast", "fast"))
+        self.assertLess(time.monotonic() - t0, 1.0)
+
+    def test_losers_do_not_hold_race_slots(self):
+        # More back-to-back races than the race pool has slots, each leaving a
+        # loser running: later races must not queue behind them.
+        t0 = time.monotonic()
+        for _ in range(4):
+            result = a._race([("slow", self.slow), ("fast", lambda p: "fast")], "hi")
+            self.assertEqual(result, ("fast", "fast"))
+        self.assertLess(time.monotonic() - t0, 2.0)
+
+    def test_loser_is_not_recorded(self):
+        a._race([("slow", self.slow), ("fast", lambda p: "fast")], "hi")
+        self.release.set()
+        time.sleep(0.3)
+        self.assertNotIn("slow", a._router_latency)
+        self.assertNotIn("slow", a._router_failures)
+        self.assertIn("fast", a._router_latency)
+
+    def test_loser_sees_cancellation(self):
+        seen = threading.Event()
+
+        def watcher(prompt):
+            while not a._race_cancelled():
+                time.sleep(0.01)
+            seen.set()
+            return None
+
+        a._race([("watcher", watcher), ("fast", lambda p: "fast")], "hi")
+        self.assertTrue(seen.wait(2))
+
+
+class HeadStartTest(unittest.TestCase):
+    def setUp(self):
+        _reset_router()
+        self.remote_calls = 0
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def remote(self, prompt):
+        self.remote_calls += 1
+        return "remote"
+
+    def test_quick_local_reply_skips_fan_out(self):
+        result = a._race(
+            [("ollama", lambda p: "local"), ("puter", self.remote), ("gemini", self.remote)],
+            "hi",
+            head_start=1.0,
+        )
+        self.assertEqual(result, ("local", "ollama"))
+        self.assertEqual(self.remote_calls, 0)
+
+    def test_slow_local_fans_out_after_head_start(self):
+        def slow_local(prompt):
+            self.release.wait(5)
+            return "local"
+
+        t0 = time.monotonic()
+        result = a._race([("ollama", slow_local), ("puter", self.remote)], "hi", head_start=0.2)
+        self.assertEqual(result, ("remote", "puter"))
+        self.assertGreaterEqual(time.monotonic() - t0, 0.2)
+        self.assertLess(time.monotonic() - t0, 1.5)
+
+    def test_failed_local_fans_out_at_once(self):
+        t0 = time.monotonic()
+        result = a._race([("ollama", lambda p: None), ("puter", self.remote)], "hi", head_start=5)
+        self.assertEqual(result, ("remote", "puter"))
+        self.assertLess(time.monotonic() - t0, 1.0)
+
+class _FakeProc:
+    """Enough of a Popen for _PuterNodeWorker: a stdin that may be dead."""
+
+    def __init__(self, lines: queue.Queue, reply: bool = True, dead: bool = False):
+        self.lines = lines
+        self.reply = reply
+        self.dead = dead
+        self.stdin = self
+        self.stdout = None
+        self.writes = []
+        self.closed = False
+
+    def poll(self):
+        return None
+
+    def write(self, data):
+        if self.dead:
+            raise BrokenPipeError("worker exited")
+        self.writes.append(data)
+        if self.reply:
+            import json
+
+            rid = json.loads(data)["id"]
+            self.lines.put(json.dumps({"id": rid, "ok": True, "text": "pong"}) + "\n")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def kill(self):
+        pass
+
+    def wait(self, timeout=None):
+        return 0
+
+
+class PuterWorkerTest(unittest.TestCase):
+    def worker(self, proc_factory):
+        w = a._PuterNodeWorker()
+        procs = []
+
+        def start():
+            lines = queue.Queue()
+            proc = proc_factory(lines, len(procs))
+            procs.append(proc)
+            w._proc, w._lines = proc, lines
+
+        w._start = start
+        return w, procs
+
+    def test_cancelled_request_releases_lock(self):
+        w, _procs = self.worker(lambda lines, n: _FakeProc(lines, reply=False))
+        cancel = threading.Event()
+        out = {}
+
+        def run():
+            out["resp"] = a._run_backend(lambda p: w.request(["chat", p], "tok", timeout=30), "hi", cancel)
+
+        t = threading.Thread(target=run)
+        t.start()
+        time.sleep(0.2)
+        self.assertTrue(w._lock.locked())
+        cancel.set()
+        t.join(2)
+        self.assertFalse(t.is_alive())
+        self.assertIsNone(out["resp"])
+        self.assertFalse(w._lock.locked())
+
+    def test_dead_idle_worker_is_resent_once(self):
+        w, procs = self.worker(lambda lines, n: _FakeProc(lines, dead=(n == 0)))
+        w._start()
+        payload = w.request(["chat", "hi"], "tok", timeout=5)
+        self.assertEqual(payload, {"ok": True, "text": "pong"})
+        self.assertEqual(len(procs), 2)
+        self.assertEqual(len(procs[1].writes), 1)
+        self.assertTrue(procs[0].closed)
+
+    def test_gives_up_after_second_dead_worker(self):
+        w, procs = self.worker(lambda lines, n: _FakeProc(lines, dead=True))
+        w._start()
+        self.assertIsNone(w.request(["chat", "hi"], "tok", timeout=5))
+        self.assertEqual(len(procs), 2)
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        _reset_router()
+        self.calls = 0
+        self.saved = (a._router_backends, a.ROUTER_CACHE_TTL)
+        a._router_backends = lambda local_only: {"ollama": self.backend}
+        self.addCleanup(self.restore)
+
+    def restore(self):
+        a._router_backends, a.ROUTER_CACHE_TTL = self.saved
+        _reset_router()
+
+    def backend(self, prompt):
+        self.calls += 1
+        return f"reply {self.calls}"
+
+    def test_hit_within_ttl(self):
+        a.ROUTER_CACHE_TTL = 60
+        self.assertEqual(a.ask_router("hello"), ("reply 1", "ollama"))
+        self.assertEqual(a.ask_router("hello"), ("reply 1", "ollama"))
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_entry_is_refetched(self):
+        a.ROUTER_CACHE_TTL = 0
+        self.assertEqual(a.ask_router("hello"), ("reply 1", "ollama"))
+        self.assertEqual(a.ask_router("hello"), ("reply 2", "ollama"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""V0formula scoring: the automaton pass must agree with the str.count scan."""
+
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# V0formula.py imports its siblings as top-level modules.
+for sub in ("", "cognition", "llm", "memory", "collective"):
+    p = str(ROOT / sub)
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+import V0formula  # noqa: E402
+
+
+def _fallback(weights):
+    f = V0formula.V0Formula(weights)
+    f._automaton = None
+    return f
+
+
+@unittest.skipIf(V0formula.ahocorasick is None, "pyahocorasick not installed")
+class AutomatonParityTest(unittest.TestCase):
+    def assertParity(self, weights, text):
+        fast = V0formula.V0Formula(weights)
+        self.assertIsNotNone(fast._automaton)
+        self.assertEqual(fast.calculate(text), _fallback(weights).calculate(text))
+
+    def test_overlapping_keywords(self):
+        weights = {"time": {"haha": 1, "ha": 1}, "meaning": {"aa": 2}}
+        self.assertParity(weights, "hahaha aaaa")
+        self.assertEqual(
+            V0formula.V0Formula(weights).calculate("hahaha aaaa"),
+            {"time": 4, "meaning": 4, "reflection": 0, "gravity": 0},
+        )
+
+    def test_shared_keyword_across_categories(self):
+        weights = {"time": {"now": 2}, "gravity": {"now": 3, "ow": 1}}
+        self.assertParity(weights, "nownow, know nothing")
+
+    def test_random_texts(self):
+        rng = random.Random(1234)
+        alphabet = "ab é"
+        for _ in range(200):
+            weights = {
+                cat: {
+                    "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 3))): rng.randint(1, 5)
+                    for _ in range(rng.randint(0, 3))
+                }
+                for cat in V0formula.V0Formula.CATEGORIES
+            }
+            if not any(weights.values()):
+                continue
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            self.assertParity(weights, text)
+
+    def test_empty_keyword_uses_scan(self):
+        weights = {"time": {"": 1, "a": 1}}
+        self.assertIsNone(V0formula.V0Formula(weights)._automaton)
+
+
+if __name__ == "__main__":
+    unittest.main()